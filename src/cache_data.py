@@ -1,24 +1,74 @@
 import requests
-import json
-from os import listdir, makedirs
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from os import listdir
 from pathlib import Path
+from threading import local
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
-from configuration import PDFS_PATH, CACHED_DATA_PATH, DOCUMENT_LAYOUT_ANALYSIS_URL
+from urllib3.util.retry import Retry
+from configuration import PDFS_PATH, DOCUMENT_LAYOUT_ANALYSIS_URL, LAYOUT_ANALYSIS_CACHE_PATH
+from layout_analysis_cache import (
+    get_manifest_entry,
+    get_segment_boxes_path,
+    load_manifest,
+    update_manifest,
+    write_segment_boxes,
+)
 
+thread_data = local()
 
-def save_cache_json(pdf_name, response):
-    Path(CACHED_DATA_PATH, pdf_name.replace(".pdf", ".json")).write_text(json.dumps(response.json(), indent=4))
 
+def get_session() -> requests.Session:
+    if not hasattr(thread_data, "session"):
+        retry = Retry(total=3, backoff_factor=2, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=None)
+        session = requests.Session()
+        session.mount("http://", HTTPAdapter(max_retries=retry))
+        session.mount("https://", HTTPAdapter(max_retries=retry))
+        thread_data.session = session
+    return thread_data.session
 
-def cache_layout_analysis():
-    for pdf_name in tqdm(sorted(listdir(PDFS_PATH))):
-        if Path(CACHED_DATA_PATH, pdf_name.replace(".pdf", ".json")).exists():
-            continue
-        pdf_path: Path = Path(PDFS_PATH, pdf_name)
-        with open(pdf_path, "rb") as pdf_file:
-            files = {"file": pdf_file}
-            response = requests.post(DOCUMENT_LAYOUT_ANALYSIS_URL, files=files)
-            save_cache_json(pdf_name, response)
+
+def post_pdf(pdf_name: str, pdf_hash: str, url: str, timeout: float, output_path: Path) -> str:
+    session = get_session()
+    with open(Path(PDFS_PATH, pdf_name), "rb") as pdf_file:
+        response = session.post(url, files={"file": pdf_file}, timeout=timeout)
+    response.raise_for_status()
+    write_segment_boxes(pdf_hash, response.json(), output_path)
+    return pdf_name
+
+
+def cache_layout_analysis(
+    worker_count: int = 1,
+    url: str = DOCUMENT_LAYOUT_ANALYSIS_URL,
+    timeout: float = 600,
+    output_path: Path = LAYOUT_ANALYSIS_CACHE_PATH,
+):
+    manifest = load_manifest(output_path)
+    pdf_names = [pdf_name for pdf_name in sorted(listdir(PDFS_PATH)) if pdf_name.endswith(".pdf")]
+    failed_pdf_names: list[str] = []
+    with ThreadPoolExecutor(max_workers=worker_count) as executor:
+        manifest_entries = dict(zip(pdf_names, executor.map(lambda name: get_manifest_entry(name, manifest), pdf_names)))
+        cached_entries = {
+            pdf_name: manifest_entry
+            for pdf_name, manifest_entry in manifest_entries.items()
+            if get_segment_boxes_path(manifest_entry["hash"], output_path).exists()
+        }
+        futures = {
+            executor.submit(post_pdf, pdf_name, manifest_entry["hash"], url, timeout, output_path): pdf_name
+            for pdf_name, manifest_entry in manifest_entries.items()
+            if pdf_name not in cached_entries
+        }
+        try:
+            for future in tqdm(as_completed(futures), total=len(futures)):
+                try:
+                    pdf_name = future.result()
+                    cached_entries[pdf_name] = manifest_entries[pdf_name]
+                except requests.RequestException as exception:
+                    failed_pdf_names.append(futures[future])
+                    print(f"LAYOUT ANALYSIS FAILED FOR {futures[future]}: {exception}")
+        finally:
+            update_manifest(cached_entries, output_path)
+    return failed_pdf_names
 
 
 if __name__ == "__main__":
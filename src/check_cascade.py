@@ -0,0 +1,81 @@
+import json
+from collections import defaultdict
+from os import listdir
+from pathlib import Path
+from statistics import median
+from time import time
+
+from configuration import ROOT_PATH
+from methods.FlairOpennyaiSmTrfNERExtractor import FlairOpennyaiSmTrfNERExtractor
+
+LABELED_DATA_PATH = Path(ROOT_PATH, "cejil_labeled_data")
+
+
+def get_labeled_segment_texts() -> list[str]:
+    cached_data_path = Path(LABELED_DATA_PATH, "cached_data")
+    texts = []
+    for file_name in sorted(listdir(cached_data_path)):
+        if not file_name.endswith(".json"):
+            continue
+        segment_boxes: list[dict] = json.loads(Path(cached_data_path, file_name).read_text())
+        texts.extend(" ".join(segment_box["text"].split()) for segment_box in segment_boxes if segment_box["text"].strip())
+    return texts
+
+
+def get_entity_keys_by_label(entities_by_text: list[list[dict]]) -> dict[str, set[tuple]]:
+    entity_keys_by_label = defaultdict(set)
+    for text_index, entities in enumerate(entities_by_text):
+        for entity in entities:
+            entity_keys_by_label[entity["entity_label"]].add((text_index, entity["start_index"], entity["end_index"]))
+    return entity_keys_by_label
+
+
+def get_name_label_recall(entities_by_text: list[list[dict]]) -> float:
+    name_labels = Path(LABELED_DATA_PATH, "labels", "name_labels.txt").read_text().split("\n")
+    name_label_groups = [{name.strip() for name in name_labels_string.split(",")} for name_labels_string in name_labels]
+    found_names = {
+        entity["text"] for entities in entities_by_text for entity in entities if entity["entity_label"] == "PERSON"
+    }
+    return sum(1 for name_label_group in name_label_groups if name_label_group & found_names) / len(name_label_groups)
+
+
+def get_prediction_time(extractor: FlairOpennyaiSmTrfNERExtractor, texts: list[str], cascade: bool):
+    extractor.cascade = cascade
+    extractor.cascade_report = dict.fromkeys(extractor.cascade_report, 0)
+    start = time()
+    entities_by_text = extractor.predict_texts(texts)
+    return time() - start, entities_by_text
+
+
+def check_cascade(run_count: int = 5):
+    texts = get_labeled_segment_texts()
+    extractor = FlairOpennyaiSmTrfNERExtractor()
+    extractor.predict_texts(texts)
+
+    full_times, cascade_times = [], []
+    for _ in range(run_count):
+        full_time, full_entities_by_text = get_prediction_time(extractor, texts, cascade=False)
+        cascade_time, cascade_entities_by_text = get_prediction_time(extractor, texts, cascade=True)
+        full_times.append(full_time)
+        cascade_times.append(cascade_time)
+
+    extractor.print_cascade_report()
+    full_time, cascade_time = median(full_times), median(cascade_times)
+    print(f"\nMEDIAN OF {run_count} WARM RUNS")
+    print(f"FULL: {round(full_time, 2)} seconds, CASCADE: {round(cascade_time, 2)} seconds")
+    print(f"SPEEDUP: {round(full_time / cascade_time, 2)}x")
+
+    full_keys_by_label = get_entity_keys_by_label(full_entities_by_text)
+    cascade_keys_by_label = get_entity_keys_by_label(cascade_entities_by_text)
+    print("\nRECALL AGAINST FULL EXECUTION")
+    for label, full_keys in sorted(full_keys_by_label.items()):
+        found_count = len(full_keys & cascade_keys_by_label[label])
+        print(f"{label}: {found_count}/{len(full_keys)} ({round(100 * found_count / len(full_keys), 2)}%)")
+
+    print("\nRECALL ON NAME LABELS")
+    print(f"FULL: {round(100 * get_name_label_recall(full_entities_by_text), 2)}%")
+    print(f"CASCADE: {round(100 * get_name_label_recall(cascade_entities_by_text), 2)}%")
+
+
+if __name__ == "__main__":
+    check_cascade()
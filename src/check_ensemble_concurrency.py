@@ -0,0 +1,26 @@
+from time import time
+
+from methods.MultipleEntityExtractor import MultipleEntityExtractor
+from model_registry import print_load_reports
+
+
+def check_ensemble_concurrency(pdf_name: str, worker_count: int = 3, torch_thread_count: int = None):
+    sequential_extractor = MultipleEntityExtractor()
+    sequential_extractor.extract_entities(pdf_name)
+    start = time()
+    sequential_entities = sequential_extractor.extract_entities(pdf_name)
+    sequential_time = time() - start
+    print(f"SEQUENTIAL: {round(sequential_time, 2)} seconds")
+
+    concurrent_extractor = MultipleEntityExtractor(worker_count=worker_count, torch_thread_count=torch_thread_count)
+    start = time()
+    concurrent_entities = concurrent_extractor.extract_entities(pdf_name)
+    concurrent_time = time() - start
+    print(f"CONCURRENT ({worker_count} workers): {round(concurrent_time, 2)} seconds")
+    print(f"SPEEDUP: {round(sequential_time / concurrent_time, 2)}x")
+    print(f"SAME ENTITIES: {concurrent_entities == sequential_entities}")
+    print_load_reports()
+
+
+if __name__ == "__main__":
+    check_ensemble_concurrency("cejil_staging33")
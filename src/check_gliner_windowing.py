@@ -0,0 +1,51 @@
+from collections import defaultdict
+
+from gliner import GLiNER
+
+from configuration import PDFS_PATH
+from data_model.DocumentTextIndex import DocumentTextIndex
+from data_model.PdfWords import PdfWords
+from layout_analysis_cache import load_segment_boxes
+from methods.GLiNERWindowPredictor import GLiNERWindowPredictor
+
+
+def get_fixed_window_ranges(words: list[str], window_size: int = 20, slide_size: int = 10) -> list[tuple[int, int]]:
+    return [(i, min(i + window_size, len(words))) for i in range(0, len(words), slide_size)]
+
+
+def get_model_token_count(predictor: GLiNERWindowPredictor, words: list[str], window_ranges: list[tuple[int, int]]):
+    prompt_token_count = sum(1 + len(predictor.transformer_tokenizer.tokenize(label)) for label in predictor.labels) + 3
+    text_token_count = sum(predictor.get_token_counts(word)[1] for start, end in window_ranges for word in words[start:end])
+    return text_token_count + prompt_token_count * len(window_ranges)
+
+
+def compare_windowing(file_name: str, labels: list[str], token_budget: int = 256):
+    predictor = GLiNERWindowPredictor(GLiNER.from_pretrained("urchade/gliner_multi-v2.1"), labels, token_budget)
+    pdf_words: PdfWords = PdfWords.from_pdf_path(PDFS_PATH / f"{file_name}.pdf", use_cache=True)
+    document_text_index = DocumentTextIndex.from_pdf_words(pdf_words, load_segment_boxes(file_name))
+
+    fixed_token_counts = defaultdict(int)
+    adaptive_token_counts = defaultdict(int)
+    fixed_window_count = adaptive_window_count = 0
+    for segment_text in document_text_index:
+        page_number = segment_text.segment_box["page_number"]
+        fixed_ranges = get_fixed_window_ranges(segment_text.words)
+        adaptive_ranges = predictor.get_window_ranges(segment_text.words)
+        fixed_token_counts[page_number] += get_model_token_count(predictor, segment_text.words, fixed_ranges)
+        adaptive_token_counts[page_number] += get_model_token_count(predictor, segment_text.words, adaptive_ranges)
+        fixed_window_count += len(fixed_ranges)
+        adaptive_window_count += len(adaptive_ranges)
+
+    for page_number in sorted(fixed_token_counts):
+        fixed_count = fixed_token_counts[page_number]
+        adaptive_count = adaptive_token_counts[page_number]
+        print(f"PAGE {page_number}: {fixed_count} -> {adaptive_count} tokens ({round(fixed_count / adaptive_count, 2)}x)")
+
+    fixed_total = sum(fixed_token_counts.values())
+    adaptive_total = sum(adaptive_token_counts.values())
+    print(f"WINDOWS: {fixed_window_count} -> {adaptive_window_count}")
+    print(f"TOKENS: {fixed_total} -> {adaptive_total} ({round(fixed_total / adaptive_total, 2)}x)")
+
+
+if __name__ == "__main__":
+    compare_windowing("cejil_staging33", ["date"])
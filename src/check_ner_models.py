@@ -1,10 +1,7 @@
-import json
-from pathlib import Path
-
 from transformers import AutoTokenizer, AutoModelForTokenClassification, AutoConfig
 from transformers import pipeline
 
-from configuration import CACHED_DATA_PATH
+from layout_analysis_cache import load_segment_boxes
 
 
 def aggregate_entities(ner_results: list[dict]):
@@ -58,7 +55,7 @@ def check_bert_base_ner():
     config = AutoConfig.from_pretrained("dslim/bert-base-NER")
     print(config.id2label)
 
-    segment_boxes: list[dict] = json.loads(Path(CACHED_DATA_PATH, "example.json").read_text())
+    segment_boxes: list[dict] = load_segment_boxes("example")
     # all_text = "\n".join([segment["text"] for segment in segment_boxes])
     all_text = segment_boxes[0]["text"]
     nlp = pipeline("ner", model=model, tokenizer=tokenizer)
@@ -73,7 +70,7 @@ def check_xlm_robert_large_conll03():
     config = AutoConfig.from_pretrained("xlm-roberta-large-finetuned-conll03-english")
     print(config.id2label)
 
-    segment_boxes: list[dict] = json.loads(Path(CACHED_DATA_PATH, "cejil_staging33.json").read_text())
+    segment_boxes: list[dict] = load_segment_boxes("cejil_staging33")
     # all_text = "\n".join([segment["text"] for segment in segment_boxes])
     classifier = pipeline("ner", model=model, tokenizer=tokenizer)
     # print(classifier("Alya told Jasmine that Andrew could pay with cash.."))
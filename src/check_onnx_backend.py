@@ -0,0 +1,70 @@
+from time import time
+
+from layout_analysis_cache import load_segment_boxes
+from methods.CustomLegalBert import CustomLegalBert
+from methods.LegalBertBase import LegalBertBase
+from methods.MultilangPIINer import MultilangPIINer
+from methods.NERTransformerModel import NERTransformerModel
+from model_registry import print_load_reports
+
+BACKENDS = [("torch", False), ("onnx", False), ("onnx", True)]
+
+
+def get_segment_texts(file_names: list[str]) -> list[str]:
+    return [
+        " ".join(segment_box["text"].split())
+        for file_name in file_names
+        for segment_box in load_segment_boxes(file_name)
+        if segment_box["text"].strip()
+    ]
+
+
+def get_entity_keys(extractor, texts: list[str]) -> list[set[tuple[str, int, int]]]:
+    results = extractor.transformers_predictor.predict(texts)
+    return [
+        {
+            (entity["entity_label"], entity["start_index"], entity["end_index"])
+            for entity in extractor.aggregate_entities(result)
+        }
+        for result in results
+    ]
+
+
+def get_agreement(reference_keys: list[set], entity_keys: list[set]) -> tuple[float, float, float]:
+    true_positive_count = sum(len(reference & entities) for reference, entities in zip(reference_keys, entity_keys))
+    reference_count = sum(len(reference) for reference in reference_keys)
+    entity_count = sum(len(entities) for entities in entity_keys)
+    precision = true_positive_count / entity_count if entity_count else 1.0
+    recall = true_positive_count / reference_count if reference_count else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def compare_backends(extractor_type: type, model_name: str, file_names: list[str]):
+    texts = get_segment_texts(file_names)
+    print(f"\n{extractor_type.__name__} {model_name}, SEGMENT COUNT: {len(texts)}")
+    reference_keys = None
+    reference_time = None
+    for backend, quantize in BACKENDS:
+        extractor = extractor_type(model_name, backend=backend, quantize=quantize)
+        extractor.transformers_predictor.predict(texts[: extractor.batch_size])
+        start = time()
+        entity_keys = get_entity_keys(extractor, texts)
+        elapsed_time = time() - start
+        if reference_keys is None:
+            reference_keys, reference_time = entity_keys, elapsed_time
+        precision, recall, f1 = get_agreement(reference_keys, entity_keys)
+        print(
+            f"{backend}{' int8' if quantize else ''}: {round(len(texts) / elapsed_time, 2)} segments/sec",
+            f"({round(reference_time / elapsed_time, 2)}x),",
+            f"precision {round(precision, 4)}, recall {round(recall, 4)}, f1 {round(f1, 4)} against torch",
+        )
+    print_load_reports()
+
+
+if __name__ == "__main__":
+    file_names = ["cejil_staging33"]
+    compare_backends(NERTransformerModel, "dslim/bert-base-NER", file_names)
+    compare_backends(LegalBertBase, "nlpaueb_legal-bert-base-uncased", file_names)
+    compare_backends(CustomLegalBert, "casehold_custom-legalbert", file_names)
+    compare_backends(MultilangPIINer, "ar86bat_multilang-pii-ner", file_names)
@@ -1,9 +1,8 @@
-import json
 from pathlib import Path
 import spacy
-from pdf_features.Rectangle import Rectangle
 from spacy import displacy
-from configuration import CACHED_DATA_PATH, PDFS_PATH
+from configuration import PDFS_PATH
+from layout_analysis_cache import load_segment_boxes
 from data_model.EntityBox import EntityBox
 from data_model.PdfWords import PdfWords
 from data_model.WordBox import WordBox
@@ -27,18 +26,12 @@ def check_en_core_web_sm():
 
 def find_entities(file_name: str):
     pdf_words: PdfWords = PdfWords.from_pdf_path(Path(PDFS_PATH, f"{file_name}.pdf"))
-    segment_boxes: list[dict] = json.loads(Path(CACHED_DATA_PATH, f"{file_name}.json").read_text())
+    segment_boxes: list[dict] = load_segment_boxes(file_name)
     nlp = spacy.load("en_core_web_sm")
     entity_boxes: list[EntityBox] = []
     total_entity_count = 0
     for segment_box in segment_boxes:
-        segment_bounding_box = Rectangle.from_width_height(
-            segment_box["left"], segment_box["top"], segment_box["width"], segment_box["height"]
-        )
-        word_boxes_for_page = pdf_words.pdf_words[segment_box["page_number"] - 1]
-        word_boxes_in_segment: list[WordBox] = WordBox.find_word_boxes_in_rectangle(
-            segment_bounding_box, word_boxes_for_page
-        )
+        word_boxes_in_segment: list[WordBox] = pdf_words.get_word_boxes_in_segment(segment_box)
         doc = nlp(" ".join(segment_box["text"].split()))
         total_entity_count += len([ent for ent in doc.ents if ent.label_ in {"DATE", "GPE", "LAW", "ORG", "PERSON"}])
         for entity in doc.ents:
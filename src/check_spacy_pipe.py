@@ -0,0 +1,45 @@
+from time import time
+
+import spacy
+
+from layout_analysis_cache import load_segment_boxes
+from methods.SpacyBatchPredictor import SpacyBatchPredictor
+
+
+def get_segment_texts(file_names: list[str]) -> list[str]:
+    return [
+        " ".join(segment_box["text"].split())
+        for file_name in file_names
+        for segment_box in load_segment_boxes(file_name)
+        if segment_box["text"].strip()
+    ]
+
+
+def benchmark_spacy_pipe(
+    model_names: list[str], file_names: list[str], process_counts: list[int] = None, batch_size: int = 64
+):
+    texts = get_segment_texts(file_names)
+    print(f"SEGMENT COUNT: {len(texts)}")
+    for model_name in model_names:
+        nlp = spacy.load(model_name)
+        print(f"\n{model_name} PIPELINE: {nlp.pipe_names}")
+
+        start = time()
+        sequential_entities = [SpacyBatchPredictor.get_entities(nlp(text)) for text in texts]
+        sequential_time = time() - start
+        print(f"SEQUENTIAL: {round(len(texts) / sequential_time, 2)} docs/sec")
+
+        for process_count in process_counts or [1, 4, 8]:
+            predictor = SpacyBatchPredictor(nlp, batch_size, process_count)
+            start = time()
+            entities = predictor.predict(texts)
+            pipe_time = time() - start
+            print(
+                f"PIPE n_process={process_count}: {round(len(texts) / pipe_time, 2)} docs/sec",
+                f"({round(sequential_time / pipe_time, 2)}x, disabled: {predictor.disabled_components},",
+                f"same entities: {entities == sequential_entities})",
+            )
+
+
+if __name__ == "__main__":
+    benchmark_spacy_pipe(["en_legal_ner_sm", "en_legal_ner_trf"], ["cejil_staging33"])
@@ -0,0 +1,57 @@
+from time import time
+
+from pdf_features.Rectangle import Rectangle
+
+from configuration import PDFS_PATH
+from layout_analysis_cache import load_segment_boxes
+from data_model.PageWords import PageWords
+from data_model.PdfWords import PdfWords
+from data_model.WordBox import WordBox
+
+
+def get_densest_page(pdf_words: PdfWords, segment_boxes: list[dict]) -> int:
+    def get_page_cost(page_words: PageWords) -> int:
+        segment_count = len([s for s in segment_boxes if s["page_number"] == page_words.page_number])
+        return len(page_words) * segment_count
+
+    return max(pdf_words.pages_words, key=get_page_cost).page_number
+
+
+def time_repeated(function, repeat_count: int):
+    start = time()
+    result = None
+    for _ in range(repeat_count):
+        result = function()
+    return result, (time() - start) / repeat_count
+
+
+def benchmark_word_box_assignment(file_name: str, repeat_count: int = 20):
+    pdf_words: PdfWords = PdfWords.from_pdf_path(PDFS_PATH / f"{file_name}.pdf")
+    segment_boxes: list[dict] = load_segment_boxes(file_name)
+    page_number = get_densest_page(pdf_words, segment_boxes)
+    page_words: PageWords = pdf_words.pages_words[page_number - 1]
+    word_boxes: list[WordBox] = page_words.get_word_boxes()
+    rectangles: list[Rectangle] = [
+        PdfWords.get_segment_bounding_box(s) for s in segment_boxes if s["page_number"] == page_number
+    ]
+    print(f"PAGE: {page_number}, WORDS: {len(page_words)}, SEGMENTS: {len(rectangles)}")
+
+    loop_result, loop_time = time_repeated(
+        lambda: [WordBox.find_word_boxes_in_rectangle(rectangle, word_boxes) for rectangle in rectangles], repeat_count
+    )
+    vector_result, vector_time = time_repeated(
+        lambda: [page_words.find_indexes_in_rectangle(rectangle) for rectangle in rectangles], repeat_count
+    )
+    matrix_result, matrix_time = time_repeated(lambda: page_words.find_indexes_in_rectangles(rectangles), repeat_count)
+
+    index_by_word_box = {id(word_box): index for index, word_box in enumerate(word_boxes)}
+    loop_membership = [[index_by_word_box[id(word_box)] for word_box in result] for result in loop_result]
+    print("SAME MEMBERSHIP (VECTOR): ", loop_membership == [indexes.tolist() for indexes in vector_result])
+    print("SAME MEMBERSHIP (MATRIX): ", loop_membership == [indexes.tolist() for indexes in matrix_result])
+    print("LOOP:   ", round(loop_time * 1000, 3), "ms")
+    print("VECTOR: ", round(vector_time * 1000, 3), "ms", f"({round(loop_time / vector_time, 1)}x)")
+    print("MATRIX: ", round(matrix_time * 1000, 3), "ms", f"({round(loop_time / matrix_time, 1)}x)")
+
+
+if __name__ == "__main__":
+    benchmark_word_box_assignment("cejil_staging33")
@@ -4,6 +4,10 @@ from pathlib import Path
 SRC_PATH = Path(__file__).parent.absolute()
 ROOT_PATH = Path(__file__).parent.parent.absolute()
 CACHED_DATA_PATH = Path(ROOT_PATH, "data", "cached_data")
+PDF_WORDS_CACHE_PATH = Path(CACHED_DATA_PATH, "pdf_words")
+LAYOUT_ANALYSIS_CACHE_PATH = Path(CACHED_DATA_PATH, "layout_analysis")
+ONNX_MODELS_PATH = Path(ROOT_PATH, "data", "onnx_models")
+NER_RESULTS_CACHE_PATH = Path(CACHED_DATA_PATH, "ner_results.sqlite")
 PDFS_PATH = Path(ROOT_PATH, "data", "pdfs")
 VISUALIZATIONS_PATH = Path(ROOT_PATH, "data", "visualizations")
 DOCUMENT_LAYOUT_ANALYSIS_URL = "http://localhost:5060"
@@ -12,6 +16,12 @@ if not CACHED_DATA_PATH.parent.exists():
     makedirs(CACHED_DATA_PATH.parent, exist_ok=True)
 if not CACHED_DATA_PATH.exists():
     makedirs(CACHED_DATA_PATH, exist_ok=True)
+if not PDF_WORDS_CACHE_PATH.exists():
+    makedirs(PDF_WORDS_CACHE_PATH, exist_ok=True)
+if not LAYOUT_ANALYSIS_CACHE_PATH.exists():
+    makedirs(LAYOUT_ANALYSIS_CACHE_PATH, exist_ok=True)
+if not ONNX_MODELS_PATH.exists():
+    makedirs(ONNX_MODELS_PATH, exist_ok=True)
 if not PDFS_PATH.exists():
     makedirs(PDFS_PATH, exist_ok=True)
 if not VISUALIZATIONS_PATH.exists():
@@ -0,0 +1,21 @@
+from data_model.PdfWords import PdfWords
+from data_model.SegmentText import SegmentText
+
+
+class DocumentTextIndex:
+    def __init__(self, segment_texts: list[SegmentText]):
+        self.segment_texts: list[SegmentText] = segment_texts
+
+    def __len__(self):
+        return len(self.segment_texts)
+
+    def __iter__(self):
+        return iter(self.segment_texts)
+
+    @staticmethod
+    def from_pdf_words(pdf_words: PdfWords, segment_boxes: list[dict]) -> "DocumentTextIndex":
+        word_boxes_by_segment = pdf_words.assign_word_boxes_to_segments(segment_boxes)
+        segment_texts = [
+            SegmentText(segment_box, word_boxes) for segment_box, word_boxes in zip(segment_boxes, word_boxes_by_segment)
+        ]
+        return DocumentTextIndex(segment_texts)
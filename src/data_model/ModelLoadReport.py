@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class ModelLoadReport:
+    model_key: str
+    load_seconds: float
+    resident_memory_mb: float
+    parameter_memory_mb: float | None = None
+
+    def __str__(self):
+        parameter_memory = "" if self.parameter_memory_mb is None else f", parameters {self.parameter_memory_mb} MB"
+        return f"{self.model_key}: loaded in {self.load_seconds} s, +{self.resident_memory_mb} MB resident{parameter_memory}"
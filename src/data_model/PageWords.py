@@ -0,0 +1,95 @@
+import numpy as np
+from pdf_features.Rectangle import Rectangle
+from data_model.WordBox import WordBox
+
+
+class PageWords:
+    def __init__(
+        self,
+        page_number: int,
+        page_width: int,
+        page_height: int,
+        lefts: np.ndarray,
+        tops: np.ndarray,
+        rights: np.ndarray,
+        bottoms: np.ndarray,
+        text: str,
+        text_offsets: np.ndarray,
+    ):
+        self.page_number = page_number
+        self.page_width = page_width
+        self.page_height = page_height
+        self.lefts: np.ndarray = lefts
+        self.tops: np.ndarray = tops
+        self.rights: np.ndarray = rights
+        self.bottoms: np.ndarray = bottoms
+        self.text: str = text
+        self.text_offsets: np.ndarray = text_offsets
+
+    def __len__(self):
+        return len(self.lefts)
+
+    def __str__(self):
+        return f"PageWords(page_number={self.page_number}, word_count={len(self)})"
+
+    def __repr__(self):
+        return self.__str__()
+
+    @staticmethod
+    def from_word_boxes(word_boxes: list[WordBox], page_number: int, page_width: int, page_height: int) -> "PageWords":
+        text_offsets = np.zeros(len(word_boxes) + 1, dtype=np.int32)
+        np.cumsum([len(word_box.text) for word_box in word_boxes], out=text_offsets[1:])
+        return PageWords(
+            page_number=page_number,
+            page_width=page_width,
+            page_height=page_height,
+            lefts=np.array([word_box.bounding_box.left for word_box in word_boxes], dtype=np.float32),
+            tops=np.array([word_box.bounding_box.top for word_box in word_boxes], dtype=np.float32),
+            rights=np.array([word_box.bounding_box.right for word_box in word_boxes], dtype=np.float32),
+            bottoms=np.array([word_box.bounding_box.bottom for word_box in word_boxes], dtype=np.float32),
+            text="".join([word_box.text for word_box in word_boxes]),
+            text_offsets=text_offsets,
+        )
+
+    def get_text(self, index: int) -> str:
+        return self.text[self.text_offsets[index] : self.text_offsets[index + 1]]
+
+    def get_word_box(self, index: int) -> WordBox:
+        bounding_box = Rectangle.from_coordinates(
+            int(self.lefts[index]), int(self.tops[index]), int(self.rights[index]), int(self.bottoms[index])
+        )
+        return WordBox(self.get_text(index), bounding_box, self.page_number, self.page_width, self.page_height)
+
+    def get_word_boxes(self, indexes: np.ndarray | list[int] = None) -> list[WordBox]:
+        if indexes is None:
+            indexes = range(len(self))
+        return [self.get_word_box(index) for index in indexes]
+
+    def get_intersection_percentages(self, rectangles: list[Rectangle], indexes: np.ndarray = None) -> np.ndarray:
+        indexes = np.arange(len(self)) if indexes is None else np.asarray(indexes, dtype=np.int64)
+        lefts = self.lefts[indexes].astype(np.float64)
+        tops = self.tops[indexes].astype(np.float64)
+        rights = self.rights[indexes].astype(np.float64)
+        bottoms = self.bottoms[indexes].astype(np.float64)
+        rectangle_lefts = np.array([[rectangle.left] for rectangle in rectangles], dtype=np.float64)
+        rectangle_tops = np.array([[rectangle.top] for rectangle in rectangles], dtype=np.float64)
+        rectangle_rights = np.array([[rectangle.right] for rectangle in rectangles], dtype=np.float64)
+        rectangle_bottoms = np.array([[rectangle.bottom] for rectangle in rectangles], dtype=np.float64)
+
+        intersection_widths = np.minimum(rights, rectangle_rights) - np.maximum(lefts, rectangle_lefts)
+        intersection_heights = np.minimum(bottoms, rectangle_bottoms) - np.maximum(tops, rectangle_tops)
+        areas = (rights - lefts) * (bottoms - tops)
+        intersects = (intersection_widths > 0) & (intersection_heights > 0)
+        intersection_percentages = np.zeros((len(rectangles), len(indexes)))
+        np.divide(100 * intersection_widths * intersection_heights, areas, out=intersection_percentages, where=intersects)
+        return intersection_percentages
+
+    def find_indexes_in_rectangle(self, rectangle: Rectangle, indexes: np.ndarray = None) -> np.ndarray:
+        indexes = np.arange(len(self)) if indexes is None else np.asarray(indexes, dtype=np.int64)
+        return indexes[self.get_intersection_percentages([rectangle], indexes)[0] > 50]
+
+    def find_indexes_in_rectangles(self, rectangles: list[Rectangle]) -> list[np.ndarray]:
+        if not rectangles:
+            return []
+        in_rectangle = self.get_intersection_percentages(rectangles) > 50
+        return [np.flatnonzero(row) for row in in_rectangle]
@@ -1,53 +1,234 @@
+import hashlib
 import subprocess
-import tempfile
-from os.path import join
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+from itertools import repeat
+from os import getpid, replace
 from pathlib import Path
+from tempfile import TemporaryFile
+from typing import IO
+import numpy as np
 from lxml import etree
-from lxml.etree import ElementBase
-from pdf_features.PdfFeatures import PdfFeatures
-from pdf_features.PdfPage import PdfPage
+from pdf_features.Rectangle import Rectangle
+from configuration import PDF_WORDS_CACHE_PATH
+from data_model.PageWords import PageWords
 from data_model.WordBox import WordBox
+from data_model.WordBoxIndex import WordBoxIndex
 
 
 class PdfWords:
-    def __init__(self, pdf_features: PdfFeatures, pdf_words: list[list[WordBox]]):
-        self.pdf_features: PdfFeatures = pdf_features
-        self.pdf_words: list[list[WordBox]] = pdf_words
-
-    @staticmethod
-    def get_pdf_words(pdf_path, pdf_pages: list[PdfPage]):
-        xml_path = join(tempfile.gettempdir(), "pdf_etree.xml")
-        subprocess.run(["pdftotext", "-bbox-layout", pdf_path, xml_path])
-        file_content: str = open(xml_path, errors="ignore").read()
-        file_bytes: bytes = file_content.encode("utf-8")
-        parser = etree.XMLParser(recover=True, encoding="utf-8")
-        root: ElementBase = etree.fromstring(file_bytes, parser=parser)
-        page_number = 0
-        pdf_words: list[list[WordBox]] = []
-        page_words: list[WordBox] = []
-        for element in root.iter():
-            if "page" in element.tag:
-                page_number += 1
-                if page_words:
-                    pdf_words.append(page_words)
-                page_words = []
-            elif "word" in element.tag and element.text and element.text.strip():
-                page_width = pdf_pages[page_number - 1].page_width
-                page_height = pdf_pages[page_number - 1].page_height
-                page_words.append(WordBox.from_etree_element(element, page_number, page_width, page_height))
-        if page_words:
-            pdf_words.append(page_words)
-        return pdf_words
-
-    @staticmethod
-    def from_pdf_path(pdf_path: str | Path, pdf_name: str = ""):
-
-        pdf_features: PdfFeatures = PdfFeatures.from_pdf_path(pdf_path)
-        pdf_words: list[list[WordBox]] = PdfWords.get_pdf_words(pdf_path, pdf_features.pages)
-
-        if pdf_name:
-            pdf_features.file_name = pdf_name
-        else:
+    CACHE_FORMAT_VERSION = 1
+
+    def __init__(self, pages_words: list[PageWords], file_name: str = ""):
+        self.file_name: str = file_name
+        self.pages_words: list[PageWords] = pages_words
+        self.word_box_indexes: dict[int, WordBoxIndex] = {}
+        self.word_boxes_by_segment: dict[tuple, list[WordBox]] = {}
+
+    def get_word_box_index(self, page_number: int) -> WordBoxIndex:
+        if page_number not in self.word_box_indexes:
+            self.word_box_indexes[page_number] = WordBoxIndex(self.pages_words[page_number - 1])
+        return self.word_box_indexes[page_number]
+
+    @staticmethod
+    def get_segment_key(segment_box: dict) -> tuple:
+        return (
+            segment_box["page_number"],
+            segment_box["left"],
+            segment_box["top"],
+            segment_box["width"],
+            segment_box["height"],
+        )
+
+    @staticmethod
+    def get_segment_bounding_box(segment_box: dict) -> Rectangle:
+        return Rectangle.from_width_height(
+            segment_box["left"], segment_box["top"], segment_box["width"], segment_box["height"]
+        )
+
+    def assign_word_boxes_to_segments(self, segment_boxes: list[dict]) -> list[list[WordBox]]:
+        segment_indexes_by_page: dict[int, list[int]] = {}
+        for segment_index, segment_box in enumerate(segment_boxes):
+            segment_indexes_by_page.setdefault(segment_box["page_number"], []).append(segment_index)
+
+        word_boxes_by_segment: list[list[WordBox]] = [[] for _ in segment_boxes]
+        for page_number, segment_indexes in segment_indexes_by_page.items():
+            rectangles = [self.get_segment_bounding_box(segment_boxes[index]) for index in segment_indexes]
+            page_assignments = self.get_word_box_index(page_number).find_word_boxes_in_rectangles(rectangles)
+            for segment_index, word_boxes in zip(segment_indexes, page_assignments):
+                word_boxes_by_segment[segment_index] = word_boxes
+                self.word_boxes_by_segment[self.get_segment_key(segment_boxes[segment_index])] = word_boxes
+        return word_boxes_by_segment
+
+    def get_word_boxes_in_segment(self, segment_box: dict) -> list[WordBox]:
+        segment_key = self.get_segment_key(segment_box)
+        if segment_key in self.word_boxes_by_segment:
+            return self.word_boxes_by_segment[segment_key]
+        segment_bounding_box = self.get_segment_bounding_box(segment_box)
+        return self.get_word_box_index(segment_box["page_number"]).find_word_boxes_in_rectangle(segment_bounding_box)
+
+    @staticmethod
+    def get_page_count(pdf_path) -> int:
+        result = subprocess.run(["pdfinfo", str(pdf_path)], capture_output=True, text=True)
+        for line in result.stdout.splitlines():
+            if line.startswith("Pages:"):
+                return int(line.split()[1])
+        return 0
+
+    @staticmethod
+    def get_pdf_words(pdf_path, process_count: int = 1, pages_per_chunk: int = 50) -> list[PageWords]:
+        page_count = PdfWords.get_page_count(pdf_path) if process_count > 1 else 0
+        if page_count <= pages_per_chunk:
+            return PdfWords.get_pdf_words_for_pages(pdf_path)
+
+        first_pages = list(range(1, page_count + 1, pages_per_chunk))
+        last_pages = [min(first_page + pages_per_chunk - 1, page_count) for first_page in first_pages]
+        with ProcessPoolExecutor(max_workers=process_count) as executor:
+            chunks = executor.map(PdfWords.get_pdf_words_for_pages, repeat(str(pdf_path)), first_pages, last_pages)
+            pages_words: list[PageWords] = [page_words for chunk in chunks for page_words in chunk]
+        return pages_words
+
+    @staticmethod
+    def get_pdf_words_for_pages(pdf_path, first_page: int = 1, last_page: int = None) -> list[PageWords]:
+        page_range = ["-f", str(first_page)] + (["-l", str(last_page)] if last_page else [])
+        command = ["pdftotext", "-bbox-layout"] + page_range + [str(pdf_path), "-"]
+        parse_error: etree.XMLSyntaxError | None = None
+        pages_words: list[PageWords] = []
+        with TemporaryFile() as stderr_file:
+            with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr_file) as process:
+                try:
+                    pages_words = PdfWords.parse_bbox_layout(process.stdout, first_page)
+                except etree.XMLSyntaxError as error:
+                    parse_error = error
+                    process.stdout.read()
+                return_code = process.wait()
+            if return_code != 0:
+                stderr_file.seek(0)
+                stderr = stderr_file.read().decode("utf-8", errors="replace").strip()
+                raise RuntimeError(
+                    f"pdftotext failed for {pdf_path} with return code {return_code}: {stderr}"
+                ) from parse_error
+        if parse_error is not None:
+            raise parse_error
+        return pages_words
+
+    @staticmethod
+    def parse_bbox_layout(xml_stream: IO[bytes], first_page: int = 1) -> list[PageWords]:
+        pages_words: list[PageWords] = []
+        page_word_boxes: list[WordBox] = []
+        page_number, page_width, page_height = first_page, 0, 0
+        for event, element in etree.iterparse(xml_stream, events=("start", "end"), recover=True, encoding="utf-8"):
+            if "page" in element.tag and event == "start":
+                page_number = first_page + len(pages_words)
+                page_width = int(float(element.attrib["width"]))
+                page_height = int(float(element.attrib["height"]))
+                page_word_boxes = []
+            elif "page" in element.tag:
+                pages_words.append(PageWords.from_word_boxes(page_word_boxes, page_number, page_width, page_height))
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+            elif "word" in element.tag and event == "end" and element.text and element.text.strip():
+                page_word_boxes.append(WordBox.from_etree_element(element, page_number, page_width, page_height))
+        return pages_words
+
+    @staticmethod
+    @cache
+    def get_pdftotext_version() -> str:
+        result = subprocess.run(["pdftotext", "-v"], capture_output=True, text=True)
+        output = (result.stderr or result.stdout).strip()
+        return output.splitlines()[0] if output else ""
+
+    @staticmethod
+    def get_pdf_hash(pdf_path: str | Path) -> str:
+        sha256 = hashlib.sha256()
+        with open(pdf_path, "rb") as pdf_file:
+            for chunk in iter(lambda: pdf_file.read(1024 * 1024), b""):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    @staticmethod
+    def save_pages_words(cache_path: Path, pages_words: list[PageWords]):
+        text = "".join([page_words.text for page_words in pages_words])
+        text_offsets: list[np.ndarray] = []
+        text_start = 0
+        for page_words in pages_words:
+            text_offsets.append(page_words.text_offsets[:-1].astype(np.int64) + text_start)
+            text_start += len(page_words.text)
+        text_offsets.append(np.array([text_start], dtype=np.int64))
+        empty_coordinates = [np.zeros(0, dtype=np.float32)]
+
+        temporary_path = cache_path.with_suffix(f".{getpid()}.tmp")
+        with open(temporary_path, "wb") as cache_file:
+            np.savez(
+                cache_file,
+                cache_format_version=np.array(PdfWords.CACHE_FORMAT_VERSION),
+                pdftotext_version=np.array(PdfWords.get_pdftotext_version()),
+                page_numbers=np.array([page_words.page_number for page_words in pages_words], dtype=np.int64),
+                page_widths=np.array([page_words.page_width for page_words in pages_words]),
+                page_heights=np.array([page_words.page_height for page_words in pages_words]),
+                page_word_offsets=np.cumsum([0] + [len(page_words) for page_words in pages_words], dtype=np.int64),
+                lefts=np.concatenate([page_words.lefts for page_words in pages_words] + empty_coordinates),
+                tops=np.concatenate([page_words.tops for page_words in pages_words] + empty_coordinates),
+                rights=np.concatenate([page_words.rights for page_words in pages_words] + empty_coordinates),
+                bottoms=np.concatenate([page_words.bottoms for page_words in pages_words] + empty_coordinates),
+                text=np.frombuffer(text.encode("utf-8"), dtype=np.uint8),
+                text_offsets=np.concatenate(text_offsets),
+            )
+        replace(temporary_path, cache_path)
+
+    @staticmethod
+    def load_pages_words(cache_path: Path) -> list[PageWords] | None:
+        if not cache_path.exists():
+            return None
+        with np.load(cache_path) as cached_data:
+            if "cache_format_version" not in cached_data.files:
+                return None
+            if cached_data["cache_format_version"].item() != PdfWords.CACHE_FORMAT_VERSION:
+                return None
+            if str(cached_data["pdftotext_version"]) != PdfWords.get_pdftotext_version():
+                return None
+            page_numbers = cached_data["page_numbers"]
+            page_widths = cached_data["page_widths"]
+            page_heights = cached_data["page_heights"]
+            page_word_offsets = cached_data["page_word_offsets"]
+            lefts, tops = cached_data["lefts"], cached_data["tops"]
+            rights, bottoms = cached_data["rights"], cached_data["bottoms"]
+            text = cached_data["text"].tobytes().decode("utf-8")
+            text_offsets = cached_data["text_offsets"]
+
+        pages_words: list[PageWords] = []
+        for page_index in range(len(page_numbers)):
+            first_word, last_word = page_word_offsets[page_index], page_word_offsets[page_index + 1]
+            page_text_offsets = text_offsets[first_word : last_word + 1]
+            page_words = PageWords(
+                page_number=page_numbers[page_index].item(),
+                page_width=page_widths[page_index].item(),
+                page_height=page_heights[page_index].item(),
+                lefts=lefts[first_word:last_word],
+                tops=tops[first_word:last_word],
+                rights=rights[first_word:last_word],
+                bottoms=bottoms[first_word:last_word],
+                text=text[page_text_offsets[0] : page_text_offsets[-1]],
+                text_offsets=(page_text_offsets - page_text_offsets[0]).astype(np.int32),
+            )
+            pages_words.append(page_words)
+        return pages_words
+
+    @staticmethod
+    def from_pdf_path(
+        pdf_path: str | Path, pdf_name: str = "", process_count: int = 1, pages_per_chunk: int = 50, use_cache: bool = False
+    ):
+        if not pdf_name:
             pdf_name = Path(pdf_path).parent.name if Path(pdf_path).name == "document.pdf" else Path(pdf_path).stem
-            pdf_features.file_name = pdf_name
-        return PdfWords(pdf_features, pdf_words)
+
+        cache_path = Path(PDF_WORDS_CACHE_PATH, f"{PdfWords.get_pdf_hash(pdf_path)}.npz") if use_cache else None
+        if cache_path:
+            cached_pages_words: list[PageWords] | None = PdfWords.load_pages_words(cache_path)
+            if cached_pages_words is not None:
+                return PdfWords(cached_pages_words, pdf_name)
+
+        pages_words: list[PageWords] = PdfWords.get_pdf_words(pdf_path, process_count, pages_per_chunk)
+        if cache_path:
+            PdfWords.save_pages_words(cache_path, pages_words)
+        return PdfWords(pages_words, pdf_name)
@@ -0,0 +1,47 @@
+from collections import defaultdict
+
+NON_TEXT_SEGMENT_TYPES = {"Picture", "Formula"}
+
+
+class SegmentFilter:
+    def __init__(
+        self,
+        skipped_types: set[str] = None,
+        skip_repeated_segments: bool = False,
+        repeated_page_count: int = 3,
+    ):
+        self.skipped_types: set[str] = skipped_types or set()
+        self.skip_repeated_segments = skip_repeated_segments
+        self.repeated_page_count = repeated_page_count
+
+    @staticmethod
+    def get_segment_key(segment_box: dict) -> str:
+        return " ".join(segment_box["text"].split())
+
+    def get_repeated_segment_keys(self, segment_boxes: list[dict]) -> set[str]:
+        pages_by_segment_key = defaultdict(set)
+        for segment_box in segment_boxes:
+            pages_by_segment_key[self.get_segment_key(segment_box)].add(segment_box["page_number"])
+        return {
+            segment_key
+            for segment_key, page_numbers in pages_by_segment_key.items()
+            if segment_key and len(page_numbers) >= self.repeated_page_count
+        }
+
+    def filter(self, segment_boxes: list[dict]) -> list[dict]:
+        filtered_segment_boxes = [
+            segment_box for segment_box in segment_boxes if segment_box.get("type") not in self.skipped_types
+        ]
+        if not self.skip_repeated_segments:
+            return filtered_segment_boxes
+
+        repeated_segment_keys = self.get_repeated_segment_keys(filtered_segment_boxes)
+        seen_segment_keys = set()
+        unique_segment_boxes = []
+        for segment_box in filtered_segment_boxes:
+            segment_key = self.get_segment_key(segment_box)
+            if segment_key in repeated_segment_keys and segment_key in seen_segment_keys:
+                continue
+            seen_segment_keys.add(segment_key)
+            unique_segment_boxes.append(segment_box)
+        return unique_segment_boxes
@@ -0,0 +1,24 @@
+from data_model.WordBox import WordBox
+
+
+class SegmentText:
+    def __init__(self, segment_box: dict, word_boxes: list[WordBox]):
+        self.segment_box: dict = segment_box
+        self.word_boxes: list[WordBox] = word_boxes
+        self.words: list[str] = [word_box.text for word_box in word_boxes]
+        self.text: str = " ".join(self.words)
+        self.word_start_indices: list[int] = WordBox.get_word_start_indices(word_boxes)
+
+    def __str__(self):
+        return f'SegmentText(page_number={self.segment_box["page_number"]}, text="{self.text}")'
+
+    def __repr__(self):
+        return self.__str__()
+
+    def get_window_text(self, first_word: int, last_word: int) -> str:
+        last_word = min(last_word, len(self.words))
+        if first_word >= last_word:
+            return ""
+        return self.text[
+            self.word_start_indices[first_word] : self.word_start_indices[last_word - 1] + len(self.words[last_word - 1])
+        ]
@@ -1,8 +1,11 @@
+from bisect import bisect_left, bisect_right
 from lxml.etree import ElementBase
 from pdf_features.Rectangle import Rectangle
 
 
 class WordBox:
+    __slots__ = ("text", "bounding_box", "page_number", "page_width", "page_height")
+
     def __init__(self, text: str, bounding_box: Rectangle, page_number: int, page_width: int, page_height: int):
         self.text = text
         self.bounding_box = bounding_box
@@ -43,43 +46,51 @@ class WordBox:
         return word_boxes_in_rectangle
 
     @staticmethod
-    def find_word_boxes_from_indices(word_boxes: list["WordBox"], start_index: int, end_index: int) -> list["WordBox"]:
+    def get_word_start_indices(word_boxes: list["WordBox"]) -> list[int]:
+        word_start_indices: list[int] = []
         current_index = 0
-        found_word_boxes: list["WordBox"] = []
-
         for word_box in word_boxes:
-            word_start = current_index
-            word_end = current_index + len(word_box.text)
-
-            if word_end <= start_index:
-                current_index = word_end + 1  # +1 for space before next word
-                continue
-
-            if word_start >= end_index:
-                break
+            word_start_indices.append(current_index)
+            current_index += len(word_box.text) + 1  # +1 for space before next word
+        return word_start_indices
 
-            if start_index <= word_end and word_start < end_index:
-                size_by_letter = word_box.bounding_box.width / len(word_box.text)
-
-                selection_start = max(0, start_index - word_start)
-                selection_end = min(len(word_box.text), end_index - word_start)
+    @staticmethod
+    def get_partial_word_box(word_box: "WordBox", word_start: int, start_index: int, end_index: int) -> "WordBox":
+        size_by_letter = word_box.bounding_box.width / len(word_box.text)
 
-                new_text = word_box.text[selection_start:selection_end]
-                new_left = word_box.bounding_box.left + size_by_letter * selection_start
-                new_width = size_by_letter * len(new_text)
+        selection_start = max(0, start_index - word_start)
+        selection_end = min(len(word_box.text), end_index - word_start)
 
-                new_bounding_box = Rectangle.from_width_height(
-                    left=new_left, top=word_box.bounding_box.top, width=new_width, height=word_box.bounding_box.height
-                )
+        new_text = word_box.text[selection_start:selection_end]
+        new_left = word_box.bounding_box.left + size_by_letter * selection_start
+        new_width = size_by_letter * len(new_text)
 
-                new_word_box = WordBox(
-                    new_text, new_bounding_box, word_box.page_number, word_box.page_width, word_box.page_height
-                )
-                found_word_boxes.append(new_word_box)
+        new_bounding_box = Rectangle.from_width_height(
+            left=new_left, top=word_box.bounding_box.top, width=new_width, height=word_box.bounding_box.height
+        )
 
-                if word_end >= end_index:
-                    break
+        return WordBox(new_text, new_bounding_box, word_box.page_number, word_box.page_width, word_box.page_height)
 
-            current_index = word_end + 1
+    @staticmethod
+    def find_word_boxes_from_spans(
+        word_boxes: list["WordBox"], spans: list[tuple[int, int]], word_start_indices: list[int] = None
+    ) -> list[list["WordBox"]]:
+        if word_start_indices is None:
+            word_start_indices = WordBox.get_word_start_indices(word_boxes)
+        word_end_indices = [word_start + len(wb.text) for word_start, wb in zip(word_start_indices, word_boxes)]
+
+        word_boxes_by_span: list[list[WordBox]] = []
+        for start_index, end_index in spans:
+            first_word = bisect_right(word_end_indices, start_index)
+            last_word = bisect_left(word_start_indices, end_index, lo=first_word)
+            word_boxes_by_span.append(
+                [
+                    WordBox.get_partial_word_box(word_boxes[i], word_start_indices[i], start_index, end_index)
+                    for i in range(first_word, last_word)
+                ]
+            )
+        return word_boxes_by_span
 
-        return found_word_boxes
+    @staticmethod
+    def find_word_boxes_from_indices(word_boxes: list["WordBox"], start_index: int, end_index: int) -> list["WordBox"]:
+        return WordBox.find_word_boxes_from_spans(word_boxes, [(start_index, end_index)])[0]
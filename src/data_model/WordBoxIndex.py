@@ -0,0 +1,89 @@
+import numpy as np
+from pdf_features.Rectangle import Rectangle
+from data_model.PageWords import PageWords
+from data_model.WordBox import WordBox
+
+
+class WordBoxIndex:
+    def __init__(self, page_words: PageWords, cell_size: int = 50):
+        self.page_words: PageWords = page_words
+        self.cell_size: int = cell_size
+
+        first_columns = np.maximum(np.floor_divide(page_words.lefts, cell_size).astype(np.int64), 0)
+        last_columns = np.maximum(np.floor_divide(page_words.rights, cell_size).astype(np.int64), first_columns)
+        first_rows = np.maximum(np.floor_divide(page_words.tops, cell_size).astype(np.int64), 0)
+        last_rows = np.maximum(np.floor_divide(page_words.bottoms, cell_size).astype(np.int64), first_rows)
+        self.column_count: int = int(np.max(last_columns, initial=-1)) + 1
+        self.row_count: int = int(np.max(last_rows, initial=-1)) + 1
+
+        column_spans = last_columns - first_columns + 1
+        cell_counts = column_spans * (last_rows - first_rows + 1)
+        word_indexes = np.repeat(np.arange(len(page_words), dtype=np.int64), cell_counts)
+        cell_positions = np.arange(len(word_indexes)) - np.repeat(np.cumsum(cell_counts) - cell_counts, cell_counts)
+        word_column_spans = np.repeat(column_spans, cell_counts)
+        columns = np.repeat(first_columns, cell_counts) + cell_positions % word_column_spans
+        rows = np.repeat(first_rows, cell_counts) + cell_positions // word_column_spans
+        cell_ids = rows * self.column_count + columns
+
+        cell_order = np.argsort(cell_ids, kind="stable")
+        self.cell_word_indexes: np.ndarray = word_indexes[cell_order]
+        self.cell_offsets: np.ndarray = np.searchsorted(
+            cell_ids[cell_order], np.arange(self.row_count * self.column_count + 1), side="left"
+        )
+
+    def get_cell_range(self, starts: np.ndarray, ends: np.ndarray, count: int) -> tuple[np.ndarray, np.ndarray]:
+        first_cells = np.clip(np.floor_divide(starts, self.cell_size).astype(np.int64), 0, count - 1)
+        last_cells = np.clip(np.floor_divide(ends, self.cell_size).astype(np.int64), 0, count - 1)
+        return first_cells, last_cells
+
+    def get_candidate_pairs(self, rectangle_coordinates: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        if not len(rectangle_coordinates) or not self.column_count:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        lefts, tops, rights, bottoms = rectangle_coordinates.T
+        first_columns, last_columns = self.get_cell_range(lefts, rights, self.column_count)
+        first_rows, last_rows = self.get_cell_range(tops, bottoms, self.row_count)
+        row_spans = np.where(first_columns > last_columns, 0, np.maximum(last_rows - first_rows + 1, 0))
+
+        row_rectangle_indexes = np.repeat(np.arange(len(rectangle_coordinates), dtype=np.int64), row_spans)
+        row_positions = np.arange(len(row_rectangle_indexes)) - np.repeat(np.cumsum(row_spans) - row_spans, row_spans)
+        row_starts = (first_rows[row_rectangle_indexes] + row_positions) * self.column_count
+        starts = self.cell_offsets[row_starts + first_columns[row_rectangle_indexes]]
+        ends = self.cell_offsets[row_starts + last_columns[row_rectangle_indexes] + 1]
+
+        range_lengths = ends - starts
+        range_positions = np.arange(range_lengths.sum()) - np.repeat(np.cumsum(range_lengths) - range_lengths, range_lengths)
+        word_indexes = self.cell_word_indexes[np.repeat(starts, range_lengths) + range_positions]
+        word_count = len(self.page_words)
+        pair_ids = np.unique(np.repeat(row_rectangle_indexes, range_lengths) * word_count + word_indexes)
+        return pair_ids // word_count, pair_ids % word_count
+
+    def find_indexes_in_rectangles(self, rectangles: list[Rectangle]) -> list[np.ndarray]:
+        rectangle_coordinates = np.array(
+            [[rectangle.left, rectangle.top, rectangle.right, rectangle.bottom] for rectangle in rectangles],
+            dtype=np.float64,
+        ).reshape(-1, 4)
+        rectangle_indexes, word_indexes = self.get_candidate_pairs(rectangle_coordinates)
+        rectangle_lefts, rectangle_tops, rectangle_rights, rectangle_bottoms = rectangle_coordinates[rectangle_indexes].T
+        lefts = self.page_words.lefts[word_indexes].astype(np.float64)
+        tops = self.page_words.tops[word_indexes].astype(np.float64)
+        rights = self.page_words.rights[word_indexes].astype(np.float64)
+        bottoms = self.page_words.bottoms[word_indexes].astype(np.float64)
+
+        intersection_widths = np.minimum(rights, rectangle_rights) - np.maximum(lefts, rectangle_lefts)
+        intersection_heights = np.minimum(bottoms, rectangle_bottoms) - np.maximum(tops, rectangle_tops)
+        areas = (rights - lefts) * (bottoms - tops)
+        intersects = (intersection_widths > 0) & (intersection_heights > 0)
+        intersection_percentages = np.zeros(len(word_indexes))
+        np.divide(100 * intersection_widths * intersection_heights, areas, out=intersection_percentages, where=intersects)
+
+        in_rectangle = intersection_percentages > 50
+        rectangle_indexes, word_indexes = rectangle_indexes[in_rectangle], word_indexes[in_rectangle]
+        boundaries = np.searchsorted(rectangle_indexes, np.arange(len(rectangles) + 1))
+        return [word_indexes[start:end] for start, end in zip(boundaries[:-1], boundaries[1:])]
+
+    def find_word_boxes_in_rectangle(self, rectangle: Rectangle) -> list[WordBox]:
+        return self.find_word_boxes_in_rectangles([rectangle])[0]
+
+    def find_word_boxes_in_rectangles(self, rectangles: list[Rectangle]) -> list[list[WordBox]]:
+        return [self.page_words.get_word_boxes(indexes) for indexes in self.find_indexes_in_rectangles(rectangles)]
@@ -0,0 +1,64 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+
+from dateparser.search import search_dates
+
+DATE_LANGUAGES = ("es", "en")
+CACHE_SIZE = 65536
+
+MONTH_NAMES = [
+    "jan(?:uary)?",
+    "feb(?:ruary)?",
+    "mar(?:ch)?",
+    "apr(?:il)?",
+    "may",
+    "june?",
+    "july?",
+    "aug(?:ust)?",
+    "sept?(?:ember)?",
+    "oct(?:ober)?",
+    "nov(?:ember)?",
+    "dec(?:ember)?",
+]
+SPANISH_MONTH_NAMES = [
+    "ene(?:ro)?",
+    "feb(?:rero)?",
+    "mar(?:zo)?",
+    "abr(?:il)?",
+    "may(?:o)?",
+    "jun(?:io)?",
+    "jul(?:io)?",
+    "ago(?:sto)?",
+    "sept?(?:iembre)?",
+    "set(?:iembre)?",
+    "oct(?:ubre)?",
+    "nov(?:iembre)?",
+    "dic(?:iembre)?",
+]
+DATE_CANDIDATE_PATTERN = re.compile(r"\d|\b(?:" + "|".join(MONTH_NAMES + SPANISH_MONTH_NAMES) + r")\.?(?!\w)", re.IGNORECASE)
+
+
+def may_contain_date(text: str) -> bool:
+    return DATE_CANDIDATE_PATTERN.search(text) is not None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def search_dates_cached(text: str, languages: tuple[str, ...] = DATE_LANGUAGES) -> tuple[tuple[str, datetime], ...]:
+    if not may_contain_date(text):
+        return ()
+    result = search_dates(text, languages=list(languages))
+    return tuple((date_text, date_time) for date_text, date_time in result or [])
+
+
+def find_dates(text: str, languages: tuple[str, ...] = DATE_LANGUAGES) -> list[tuple[str, datetime]]:
+    return list(search_dates_cached(text, tuple(languages)))
+
+
+def print_cache_stats():
+    cache_info = search_dates_cached.cache_info()
+    lookup_count = cache_info.hits + cache_info.misses
+    hit_rate = round(100 * cache_info.hits / lookup_count, 2) if lookup_count else 0
+    print(
+        f"DATE CACHE: {cache_info.hits} hits, {cache_info.misses} misses ({hit_rate}% hit rate), {cache_info.currsize} entries"
+    )
@@ -1,7 +1,5 @@
-import json
-from pathlib import Path
 from ollama import Client
-from configuration import CACHED_DATA_PATH
+from layout_analysis_cache import load_segment_boxes
 
 
 def print_with_line_breaks(text, line_length=150):
@@ -39,7 +37,7 @@ Here is the text you are going to find the references in:
 
 def check_model():
 
-    segment_boxes: list[dict] = json.loads(Path(CACHED_DATA_PATH, "cejil_staging33.json").read_text())
+    segment_boxes: list[dict] = load_segment_boxes("cejil_staging33")
     model_name = "llama3.2"
     client = Client(host=f"http://localhost:11434")
 
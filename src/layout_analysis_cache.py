@@ -0,0 +1,129 @@
+import json
+from os import getpid, replace
+from pathlib import Path
+from threading import Lock, get_ident
+
+import msgpack
+import zstandard
+
+from configuration import CACHED_DATA_PATH, LAYOUT_ANALYSIS_CACHE_PATH, PDFS_PATH
+from data_model.PdfWords import PdfWords
+
+MANIFEST_FILE_NAME = "manifest.json"
+COMPRESSION_LEVEL = 10
+
+manifest_lock = Lock()
+
+
+def get_pdf_name(pdf_name: str) -> str:
+    return pdf_name[: -len(".pdf")] if pdf_name.endswith(".pdf") else pdf_name
+
+
+def get_segment_boxes_path(pdf_hash: str, cache_path: Path = LAYOUT_ANALYSIS_CACHE_PATH) -> Path:
+    return Path(cache_path, f"{pdf_hash}.msgpack.zst")
+
+
+def write_atomically(path: Path, content: bytes):
+    temporary_path = path.with_name(f"{path.name}.{getpid()}.{get_ident()}.tmp")
+    temporary_path.write_bytes(content)
+    replace(temporary_path, path)
+
+
+def get_pdf_path(pdf_name: str) -> Path:
+    return Path(PDFS_PATH, f"{get_pdf_name(pdf_name)}.pdf")
+
+
+def get_pdf_stat(pdf_path: Path) -> dict[str, int]:
+    pdf_stat = pdf_path.stat()
+    return {"size": pdf_stat.st_size, "mtime_ns": pdf_stat.st_mtime_ns}
+
+
+def load_manifest(cache_path: Path = LAYOUT_ANALYSIS_CACHE_PATH) -> dict[str, dict]:
+    manifest_path = Path(cache_path, MANIFEST_FILE_NAME)
+    if not manifest_path.exists():
+        return {}
+    return json.loads(manifest_path.read_text())
+
+
+def update_manifest(manifest_entries: dict[str, dict], cache_path: Path = LAYOUT_ANALYSIS_CACHE_PATH):
+    with manifest_lock:
+        manifest = load_manifest(cache_path)
+        changed_entries = {
+            get_pdf_name(pdf_name): manifest_entry
+            for pdf_name, manifest_entry in manifest_entries.items()
+            if manifest.get(get_pdf_name(pdf_name)) != manifest_entry
+        }
+        if not changed_entries:
+            return
+        manifest.update(changed_entries)
+        write_atomically(Path(cache_path, MANIFEST_FILE_NAME), json.dumps(manifest, sort_keys=True).encode())
+
+
+def get_manifest_entry(pdf_name: str, manifest: dict[str, dict]) -> dict:
+    pdf_path = get_pdf_path(pdf_name)
+    pdf_stat = get_pdf_stat(pdf_path)
+    manifest_entry = manifest.get(get_pdf_name(pdf_name))
+    if manifest_entry and all(manifest_entry.get(key) == value for key, value in pdf_stat.items()):
+        return manifest_entry
+    return {"hash": PdfWords.get_pdf_hash(pdf_path), **pdf_stat}
+
+
+def is_cached(pdf_name: str, cache_path: Path = LAYOUT_ANALYSIS_CACHE_PATH) -> bool:
+    manifest_entry = get_manifest_entry(pdf_name, load_manifest(cache_path))
+    if not get_segment_boxes_path(manifest_entry["hash"], cache_path).exists():
+        return False
+    update_manifest({pdf_name: manifest_entry}, cache_path)
+    return True
+
+
+def write_segment_boxes(pdf_hash: str, segment_boxes: list[dict], cache_path: Path = LAYOUT_ANALYSIS_CACHE_PATH):
+    content = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).compress(msgpack.packb(segment_boxes))
+    write_atomically(get_segment_boxes_path(pdf_hash, cache_path), content)
+
+
+def read_segment_boxes(pdf_hash: str, cache_path: Path = LAYOUT_ANALYSIS_CACHE_PATH) -> list[dict]:
+    content = get_segment_boxes_path(pdf_hash, cache_path).read_bytes()
+    return msgpack.unpackb(zstandard.ZstdDecompressor().decompress(content))
+
+
+def load_segment_boxes(pdf_name: str, cache_path: Path = LAYOUT_ANALYSIS_CACHE_PATH) -> list[dict]:
+    pdf_path = get_pdf_path(pdf_name)
+    manifest = load_manifest(cache_path)
+    stored_entry = manifest.get(get_pdf_name(pdf_name))
+    manifest_entry = get_manifest_entry(pdf_name, manifest) if pdf_path.exists() else stored_entry
+    if manifest_entry and get_segment_boxes_path(manifest_entry["hash"], cache_path).exists():
+        if manifest_entry != stored_entry:
+            update_manifest({pdf_name: manifest_entry}, cache_path)
+        return read_segment_boxes(manifest_entry["hash"], cache_path)
+
+    if stored_entry and pdf_path.exists():
+        raise FileNotFoundError(f"{pdf_name} changed since its layout analysis was cached, run cache_data.py again")
+
+    json_path = Path(CACHED_DATA_PATH, f"{get_pdf_name(pdf_name)}.json")
+    if not json_path.exists():
+        raise FileNotFoundError(f"No layout analysis cached for {pdf_name}")
+    segment_boxes: list[dict] = json.loads(json_path.read_text())
+    if pdf_path.exists():
+        write_segment_boxes(manifest_entry["hash"], segment_boxes, cache_path)
+        update_manifest({pdf_name: manifest_entry}, cache_path)
+    return segment_boxes
+
+
+def migrate_json_cache(cache_path: Path = LAYOUT_ANALYSIS_CACHE_PATH):
+    manifest = load_manifest(cache_path)
+    manifest_entries = {}
+    for json_path in sorted(CACHED_DATA_PATH.glob("*.json")):
+        pdf_path = get_pdf_path(json_path.stem)
+        if not pdf_path.exists():
+            print(f"SKIPPING {json_path.name}: {pdf_path.name} NOT FOUND")
+            continue
+        manifest_entry = get_manifest_entry(json_path.stem, manifest)
+        write_segment_boxes(manifest_entry["hash"], json.loads(json_path.read_text()), cache_path)
+        manifest_entries[json_path.stem] = manifest_entry
+        segment_boxes_size = get_segment_boxes_path(manifest_entry["hash"], cache_path).stat().st_size
+        print(f"{json_path.name}: {json_path.stat().st_size} -> {segment_boxes_size} bytes")
+    update_manifest(manifest_entries, cache_path)
+
+
+if __name__ == "__main__":
+    migrate_json_cache()
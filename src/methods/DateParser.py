@@ -1,8 +1,8 @@
 from time import time
-from dateparser.search import search_dates
-from pdf_features.Rectangle import Rectangle
+from date_normalization import find_dates
 from data_model.EntityBox import EntityBox
-from data_model.WordBox import WordBox
+from data_model.SegmentFilter import SegmentFilter
+from data_model.SegmentText import SegmentText
 from methods.NERTransformerModel import NERTransformerModel
 
 
@@ -12,8 +12,8 @@ def print_with_line_breaks(text, line_length=150):
 
 
 class DateParser(NERTransformerModel):
-    def __init__(self, model_name: str = "date_parser", show_logs: bool = False):
-        super().__init__(model_name, show_logs, initialize_auto_model=False)
+    def __init__(self, model_name: str = "date_parser", show_logs: bool = False, segment_filter: SegmentFilter = None):
+        super().__init__(model_name, show_logs, initialize_auto_model=False, segment_filter=segment_filter)
 
     @staticmethod
     def find_all_occurrences(main_text: str, date_parser_result: list):
@@ -30,20 +30,14 @@ class DateParser(NERTransformerModel):
             entities.append({"text": date_text, "entity_label": "DATE", "start_index": start_index, "end_index": end_index})
         return entities
 
-    def process_segment(self, pdf_words, segment_box, total_entity_count) -> list[EntityBox]:
-        segment_bounding_box = Rectangle.from_width_height(
-            segment_box["left"], segment_box["top"], segment_box["width"], segment_box["height"]
-        )
-        word_boxes_for_page = pdf_words.pdf_words[segment_box["page_number"] - 1]
-        word_boxes_in_segment: list[WordBox] = WordBox.find_word_boxes_in_rectangle(
-            segment_bounding_box, word_boxes_for_page
-        )
+    def predict_texts(self, texts: list[str]) -> list[list[tuple]]:
+        return [find_dates(text, ("es",)) for text in texts]
 
+    def create_segment_entity_boxes(self, segment_text: SegmentText, result: list[tuple]) -> list[EntityBox]:
         entities = []
 
-        text = " ".join([wb.text for wb in word_boxes_in_segment])
-        result = search_dates(text, languages=["es"])
-        print(f"PAGE: {segment_box['page_number']}")
+        text = segment_text.text
+        print(f"PAGE: {segment_text.segment_box['page_number']}")
         print_with_line_breaks(text)
         print("-" * 30)
         if result:
@@ -54,8 +48,7 @@ class DateParser(NERTransformerModel):
             print("NO DATE FOUND")
         print("*" * 30)
 
-        total_entity_count += len(entities)
-        return self.create_entity_boxes(entities, segment_box, word_boxes_in_segment)
+        return self.create_entity_boxes(entities, segment_text)
 
 
 if __name__ == "__main__":
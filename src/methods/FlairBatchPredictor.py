@@ -0,0 +1,32 @@
+from flair.data import Sentence
+from flair.nn import Classifier
+
+
+class FlairBatchPredictor:
+    def __init__(self, classifier: Classifier, mini_batch_size: int = 32):
+        self.classifier = classifier
+        self.mini_batch_size = mini_batch_size
+
+    def predict_sentences(self, texts: list[str]) -> list[Sentence]:
+        sentences = [Sentence(text) for text in texts]
+        self.classifier.predict(sorted(sentences, key=len, reverse=True), mini_batch_size=self.mini_batch_size)
+        return sentences
+
+    @staticmethod
+    def get_entities(sentence: Sentence, tags: set[str] = None) -> list[dict]:
+        return [
+            {
+                "text": entity.text,
+                "entity_label": entity.tag,
+                "start_index": entity.start_position,
+                "end_index": entity.end_position,
+            }
+            for entity in sentence.get_spans("ner")
+            if tags is None or entity.tag in tags
+        ]
+
+    def predict(self, texts: list[str], tags: set[str] = None) -> list[list[dict]]:
+        unique_texts = list(dict.fromkeys(texts))
+        sentences = self.predict_sentences(unique_texts)
+        entities_by_text = {text: self.get_entities(sentence, tags) for text, sentence in zip(unique_texts, sentences)}
+        return [[dict(entity) for entity in entities_by_text[text]] for text in texts]
@@ -1,13 +1,23 @@
+import re
+from functools import cached_property
 from time import time
 
-import spacy
-from flair.data import Sentence
-from flair.nn import Classifier
-from pdf_features.Rectangle import Rectangle
-
 from data_model.EntityBox import EntityBox
-from data_model.WordBox import WordBox
+from data_model.SegmentFilter import SegmentFilter
+from data_model.SegmentText import SegmentText
+from methods.FlairBatchPredictor import FlairBatchPredictor
 from methods.NERTransformerModel import NERTransformerModel
+from methods.SpacyBatchPredictor import SpacyBatchPredictor
+from model_registry import get_flair_model, get_spacy_model
+
+
+REFERENCE_LABELS = {"PROVISION", "STATUTE", "CASE_NUMBER", "COURT", "PRECEDENT"}
+REFERENCE_PATTERN = re.compile(
+    r"\b(?:articles?|art[íi]culos?|conventions?|convenci[óo]n|covenant|protocols?|treaty|charter|statutes?|acts?|codes?"
+    r"|courts?|corte|tribunal|commission|comisi[óo]n|case|caso|petition|petici[óo]n)\b"
+    r"|\barts?\.|\bn(?:o|º|°)\.?\s*\d+|\b\d+/\d{2,4}\b|§|\bvs?\.\s",
+    re.IGNORECASE,
+)
 
 
 def print_with_line_breaks(text, line_length=150):
@@ -16,14 +26,37 @@ def print_with_line_breaks(text, line_length=150):
 
 
 class FlairOpennyaiSmTrfNERExtractor(NERTransformerModel):
-    def __init__(self, model_name: str = "flair_opennyai_sm_trf", show_logs: bool = False):
-        super().__init__(model_name, show_logs, initialize_auto_model=False)
+    def __init__(
+        self,
+        model_name: str = "flair_opennyai_sm_trf",
+        show_logs: bool = False,
+        mini_batch_size: int = 32,
+        spacy_batch_size: int = 64,
+        n_process: int = 1,
+        cascade: bool = False,
+        segment_filter: SegmentFilter = None,
+    ):
+        super().__init__(model_name, show_logs, initialize_auto_model=False, segment_filter=segment_filter)
         self.model_name = model_name
-        self.opennyai_sm_model = spacy.load("en_legal_ner_sm")
-        self.opennyai_trf_model = spacy.load("en_legal_ner_trf")
-        self.flair_model = Classifier.load("ner-ontonotes-large")
+        self.mini_batch_size = mini_batch_size
+        self.spacy_batch_size = spacy_batch_size
+        self.n_process = n_process
+        self.cascade = cascade
+        self.cascade_report = {"segments": 0, "sm_candidates": 0, "regex_candidates": 0, "skipped": 0}
         self.show_logs = show_logs
 
+    @cached_property
+    def flair_predictor(self) -> FlairBatchPredictor:
+        return FlairBatchPredictor(get_flair_model("ner-ontonotes-large"), self.mini_batch_size)
+
+    @cached_property
+    def opennyai_sm_predictor(self) -> SpacyBatchPredictor:
+        return SpacyBatchPredictor(get_spacy_model("en_legal_ner_sm"), self.spacy_batch_size, self.n_process)
+
+    @cached_property
+    def opennyai_trf_predictor(self) -> SpacyBatchPredictor:
+        return SpacyBatchPredictor(get_spacy_model("en_legal_ner_trf"), self.spacy_batch_size, self.n_process)
+
     @staticmethod
     def remove_overlapping_entities(entities):
         sorted_entities = sorted(entities, key=lambda x: (x["start_index"], -len(x["text"])))
@@ -38,69 +71,49 @@ class FlairOpennyaiSmTrfNERExtractor(NERTransformerModel):
 
         return result
 
-    def process_segment(self, pdf_words, segment_box, total_entity_count) -> list[EntityBox]:
-        segment_bounding_box = Rectangle.from_width_height(
-            segment_box["left"], segment_box["top"], segment_box["width"], segment_box["height"]
-        )
-        word_boxes_for_page = pdf_words.pdf_words[segment_box["page_number"] - 1]
-        word_boxes_in_segment: list[WordBox] = WordBox.find_word_boxes_in_rectangle(
-            segment_bounding_box, word_boxes_for_page
-        )
-
-        text = " ".join([wb.text for wb in word_boxes_in_segment])
-        print(f"PAGE: {segment_box['page_number']}")
-        print_with_line_breaks(text)
+    def get_candidate_indexes(self, texts: list[str], sm_entities_by_text: list[list[dict]]) -> list[int]:
+        sm_indexes = {index for index, sm_entities in enumerate(sm_entities_by_text) if sm_entities}
+        regex_indexes = {index for index, text in enumerate(texts) if REFERENCE_PATTERN.search(text)}
+        candidate_indexes = sm_indexes | regex_indexes
+        self.cascade_report["segments"] += len(texts)
+        self.cascade_report["sm_candidates"] += len(sm_indexes)
+        self.cascade_report["regex_candidates"] += len(regex_indexes - sm_indexes)
+        self.cascade_report["skipped"] += len(texts) - len(candidate_indexes)
+        return sorted(candidate_indexes)
+
+    def predict_texts(self, texts: list[str]) -> list[list[dict]]:
+        sm_entities_by_text = self.opennyai_sm_predictor.predict(texts, REFERENCE_LABELS)
+        candidate_indexes = list(range(len(texts)))
+        if self.cascade:
+            candidate_indexes = self.get_candidate_indexes(texts, sm_entities_by_text)
+
+        candidate_texts = [texts[index] for index in candidate_indexes]
+        trf_entities_by_candidate = self.opennyai_trf_predictor.predict(candidate_texts, REFERENCE_LABELS)
+        flair_entities_by_candidate = self.flair_predictor.predict(candidate_texts, {"ORG", "PERSON", "LAW", "GPE"})
+
+        entities_by_text = [list(sm_entities) for sm_entities in sm_entities_by_text]
+        for index, trf_entities, flair_entities in zip(
+            candidate_indexes, trf_entities_by_candidate, flair_entities_by_candidate
+        ):
+            entities_by_text[index].extend(trf_entities + flair_entities)
+        return entities_by_text
+
+    def print_cascade_report(self):
+        segment_count = self.cascade_report["segments"]
+        skipped_count = self.cascade_report["skipped"]
+        print(f"SEGMENTS: {segment_count}")
+        print(f"SM MODEL: ran on {segment_count}, sent {self.cascade_report['sm_candidates']} to trf and flair")
+        print(f"REGEX GATE: sent {self.cascade_report['regex_candidates']} more to trf and flair")
+        skipped_percentage = round(100 * skipped_count / segment_count, 2) if segment_count else 0
+        print(f"TRF AND FLAIR: skipped {skipped_count} ({skipped_percentage}%)")
+
+    def create_segment_entity_boxes(self, segment_text: SegmentText, entities: list[dict]) -> list[EntityBox]:
+        print(f"PAGE: {segment_text.segment_box['page_number']}")
+        print_with_line_breaks(segment_text.text)
         print("-" * 30)
 
-        opennyai_sm_result = self.opennyai_sm_model(text)
-        aggregated_entities = []
-        for entity in opennyai_sm_result.ents:
-            if entity.label_ not in {"PROVISION", "STATUTE", "CASE_NUMBER", "COURT", "PRECEDENT"}:
-                continue
-
-            aggregated_entities.append(
-                {
-                    "text": entity.text,
-                    "entity_label": entity.label_,
-                    "start_index": entity.start_char,
-                    "end_index": entity.end_char,
-                }
-            )
-
-        opennyai_trf_result = self.opennyai_trf_model(text)
-        for entity in opennyai_trf_result.ents:
-            if entity.label_ not in {"PROVISION", "STATUTE", "CASE_NUMBER", "COURT", "PRECEDENT"}:
-                continue
-
-            aggregated_entities.append(
-                {
-                    "text": entity.text,
-                    "entity_label": entity.label_,
-                    "start_index": entity.start_char,
-                    "end_index": entity.end_char,
-                }
-            )
-
-        sentence = Sentence(" ".join([wb.text for wb in word_boxes_in_segment]))
-        self.flair_model.predict(sentence)
-        flair_result = sentence.get_spans("ner")
-
-        for entity in flair_result:
-            if entity.tag not in {"ORG", "PERSON", "LAW", "GPE"}:
-                continue
-            aggregated_entities.append(
-                {
-                    "text": entity.text,
-                    "entity_label": entity.tag,
-                    "start_index": entity.start_position,
-                    "end_index": entity.end_position,
-                }
-            )
-
-        aggregated_entities = self.remove_overlapping_entities(aggregated_entities)
-
-        total_entity_count += len(aggregated_entities)
-        return self.create_entity_boxes(aggregated_entities, segment_box, word_boxes_in_segment)
+        aggregated_entities = self.remove_overlapping_entities(entities)
+        return self.create_entity_boxes(aggregated_entities, segment_text)
 
 
 if __name__ == "__main__":
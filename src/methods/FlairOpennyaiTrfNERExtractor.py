@@ -1,13 +1,13 @@
+from functools import cached_property
 from time import time
 
-import spacy
-from flair.data import Sentence
-from flair.nn import Classifier
-from pdf_features.Rectangle import Rectangle
-
 from data_model.EntityBox import EntityBox
-from data_model.WordBox import WordBox
+from data_model.SegmentFilter import SegmentFilter
+from data_model.SegmentText import SegmentText
+from methods.FlairBatchPredictor import FlairBatchPredictor
 from methods.NERTransformerModel import NERTransformerModel
+from methods.SpacyBatchPredictor import SpacyBatchPredictor
+from model_registry import get_flair_model, get_spacy_model
 
 
 def print_with_line_breaks(text, line_length=150):
@@ -16,13 +16,30 @@ def print_with_line_breaks(text, line_length=150):
 
 
 class FlairOpennyaiTrfNERExtractor(NERTransformerModel):
-    def __init__(self, model_name: str = "flair_opennyai_trf", show_logs: bool = False):
-        super().__init__(model_name, show_logs, initialize_auto_model=False)
+    def __init__(
+        self,
+        model_name: str = "flair_opennyai_trf",
+        show_logs: bool = False,
+        mini_batch_size: int = 32,
+        spacy_batch_size: int = 64,
+        n_process: int = 1,
+        segment_filter: SegmentFilter = None,
+    ):
+        super().__init__(model_name, show_logs, initialize_auto_model=False, segment_filter=segment_filter)
         self.model_name = model_name
-        self.opennyai_trf_model = spacy.load("en_legal_ner_trf")
-        self.flair_model = Classifier.load("ner-ontonotes-large")
+        self.mini_batch_size = mini_batch_size
+        self.spacy_batch_size = spacy_batch_size
+        self.n_process = n_process
         self.show_logs = show_logs
 
+    @cached_property
+    def flair_predictor(self) -> FlairBatchPredictor:
+        return FlairBatchPredictor(get_flair_model("ner-ontonotes-large"), self.mini_batch_size)
+
+    @cached_property
+    def opennyai_trf_predictor(self) -> SpacyBatchPredictor:
+        return SpacyBatchPredictor(get_spacy_model("en_legal_ner_trf"), self.spacy_batch_size, self.n_process)
+
     @staticmethod
     def remove_overlapping_entities(entities):
         sorted_entities = sorted(entities, key=lambda x: (x["start_index"], -len(x["text"])))
@@ -37,56 +54,20 @@ class FlairOpennyaiTrfNERExtractor(NERTransformerModel):
 
         return result
 
-    def process_segment(self, pdf_words, segment_box, total_entity_count) -> list[EntityBox]:
-        segment_bounding_box = Rectangle.from_width_height(
-            segment_box["left"], segment_box["top"], segment_box["width"], segment_box["height"]
-        )
-        word_boxes_for_page = pdf_words.pdf_words[segment_box["page_number"] - 1]
-        word_boxes_in_segment: list[WordBox] = WordBox.find_word_boxes_in_rectangle(
-            segment_bounding_box, word_boxes_for_page
+    def predict_texts(self, texts: list[str]) -> list[list[dict]]:
+        entities_by_text = self.opennyai_trf_predictor.predict(
+            texts, {"PROVISION", "STATUTE", "CASE_NUMBER", "COURT", "PRECEDENT"}
         )
+        flair_entities_by_text = self.flair_predictor.predict(texts, {"ORG", "PERSON", "LAW", "GPE"})
+        return [entities + flair_entities for entities, flair_entities in zip(entities_by_text, flair_entities_by_text)]
 
-        text = " ".join([wb.text for wb in word_boxes_in_segment])
-        print(f"PAGE: {segment_box['page_number']}")
-        print_with_line_breaks(text)
+    def create_segment_entity_boxes(self, segment_text: SegmentText, entities: list[dict]) -> list[EntityBox]:
+        print(f"PAGE: {segment_text.segment_box['page_number']}")
+        print_with_line_breaks(segment_text.text)
         print("-" * 30)
 
-        aggregated_entities = []
-
-        opennyai_trf_result = self.opennyai_trf_model(text)
-        for entity in opennyai_trf_result.ents:
-            if entity.label_ not in {"PROVISION", "STATUTE", "CASE_NUMBER", "COURT", "PRECEDENT"}:
-                continue
-
-            aggregated_entities.append(
-                {
-                    "text": entity.text,
-                    "entity_label": entity.label_,
-                    "start_index": entity.start_char,
-                    "end_index": entity.end_char,
-                }
-            )
-
-        sentence = Sentence(" ".join([wb.text for wb in word_boxes_in_segment]))
-        self.flair_model.predict(sentence)
-        flair_result = sentence.get_spans("ner")
-
-        for entity in flair_result:
-            if entity.tag not in {"ORG", "PERSON", "LAW", "GPE"}:
-                continue
-            aggregated_entities.append(
-                {
-                    "text": entity.text,
-                    "entity_label": entity.tag,
-                    "start_index": entity.start_position,
-                    "end_index": entity.end_position,
-                }
-            )
-
-        aggregated_entities = self.remove_overlapping_entities(aggregated_entities)
-
-        total_entity_count += len(aggregated_entities)
-        return self.create_entity_boxes(aggregated_entities, segment_box, word_boxes_in_segment)
+        aggregated_entities = self.remove_overlapping_entities(entities)
+        return self.create_entity_boxes(aggregated_entities, segment_text)
 
 
 if __name__ == "__main__":
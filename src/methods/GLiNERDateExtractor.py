@@ -1,11 +1,14 @@
 import json
-from dateparser.search import search_dates
-from gliner import GLiNER
+from date_normalization import DATE_LANGUAGES, find_dates
+from methods.GLiNERWindowPredictor import GLiNERWindowPredictor
+from model_registry import get_gliner_model
 
 
 class GLiNERDateExtractor:
-    def __init__(self):
-        self.classifier = GLiNER.from_pretrained("urchade/gliner_multi-v2.1")
+    def __init__(self, batch_size: int = 32, date_languages: tuple[str, ...] = DATE_LANGUAGES):
+        self.classifier = get_gliner_model("urchade/gliner_multi-v2.1")
+        self.window_predictor = GLiNERWindowPredictor(self.classifier, ["date"], batch_size=batch_size)
+        self.date_languages = date_languages
 
     @staticmethod
     def find_unique_entity_dicts(entities: list[dict]) -> list[dict]:
@@ -26,30 +29,16 @@ class GLiNERDateExtractor:
 
         return result
 
-    def extract_dates(self, text: str):
-        words = text.split()
-
-        entities = []
-        window_size = 20
-        slide_size = 10
-        last_slide_end_index = 0
-
-        for i in range(0, len(words), slide_size):
-            window_words = words[i : i + window_size]
-            window_text = " ".join(window_words)
-            window_entities = self.classifier.predict_entities(window_text, ["date"])
-
-            for entity in window_entities:
-                entity["start"] += last_slide_end_index
-                entity["end"] += last_slide_end_index
-
-            slide_words = words[i : i + slide_size]
-            slide_text = " ".join(slide_words)
-            last_slide_end_index += len(slide_text) + 1
-            entities.extend(window_entities)
-
+    def get_date_times(self, entities: list[dict]):
         entities = self.find_unique_entity_dicts(entities)
-        entities = [e for e in entities if search_dates(e["text"])]
+        entities = [e for e in entities if find_dates(e["text"], self.date_languages)]
         entities = self.remove_overlapping_entities(entities)
-        date_times = [d[1] for e in entities for d in search_dates(e["text"])]
+        date_times = [d[1] for e in entities for d in find_dates(e["text"], self.date_languages)]
         return date_times
+
+    def extract_dates(self, text: str):
+        return self.extract_dates_from_texts([text])[0]
+
+    def extract_dates_from_texts(self, texts: list[str]):
+        entities_by_text = self.window_predictor.predict([text.split() for text in texts])
+        return [self.get_date_times(entities) for entities in entities_by_text]
@@ -1,12 +1,16 @@
 import json
 from time import time
 
-from gliner import GLiNER
-from pdf_features.Rectangle import Rectangle
+import gliner
+
 from data_model.EntityBox import EntityBox
-from data_model.WordBox import WordBox
+from data_model.SegmentFilter import SegmentFilter
+from data_model.SegmentText import SegmentText
+from methods.GLiNERWindowPredictor import GLiNERWindowPredictor
+from methods.NERResultCache import NERResultCache
 from methods.NERTransformerModel import NERTransformerModel
-from dateparser.search import search_dates
+from model_registry import get_gliner_model
+from date_normalization import DATE_LANGUAGES, find_dates
 
 
 def print_with_line_breaks(text, line_length=150):
@@ -15,11 +19,31 @@ def print_with_line_breaks(text, line_length=150):
 
 
 class GLiNERDateParserModel(NERTransformerModel):
-    def __init__(self, model_name: str, show_logs: bool = False):
-        super().__init__(model_name, show_logs, initialize_auto_model=False)
+    def __init__(
+        self,
+        model_name: str,
+        show_logs: bool = False,
+        batch_size: int = 32,
+        segment_filter: SegmentFilter = None,
+        use_result_cache: bool = True,
+        date_languages: tuple[str, ...] = DATE_LANGUAGES,
+    ):
+        super().__init__(
+            model_name,
+            show_logs,
+            initialize_auto_model=False,
+            segment_filter=segment_filter,
+            use_result_cache=use_result_cache,
+        )
         self.model_name = model_name + "_date_parser_temp"
-        self.classifier = GLiNER.from_pretrained(model_name)
+        self.classifier = get_gliner_model(model_name)
         self.show_logs = show_logs
+        self.window_predictor = GLiNERWindowPredictor(self.classifier, ["date"], batch_size=batch_size)
+        if use_result_cache:
+            settings = self.window_predictor.get_settings()
+            self.result_cache = NERResultCache(f"gliner:{model_name}", gliner.__version__, settings)
+        self.verified_date_texts: dict[str, bool] = {}
+        self.date_languages = date_languages
 
     @staticmethod
     def find_unique_dicts(dict_list: list[dict]) -> list[dict]:
@@ -43,11 +67,10 @@ class GLiNERDateParserModel(NERTransformerModel):
 
         return result
 
-    @staticmethod
-    def get_parseable_entities(entities: list) -> list:
+    def get_parseable_entities(self, entities: list) -> list:
         parseable_entities = []
         for entity in entities:
-            if search_dates(entity["text"]):
+            if find_dates(entity["text"], self.date_languages):
                 parseable_entities.append(entity)
         return parseable_entities
 
@@ -58,62 +81,43 @@ class GLiNERDateParserModel(NERTransformerModel):
             text = text[: entity["start_index"]] + replacement + text[entity["end_index"] :]
         return text
 
-    def get_date_parser_predictions(self, text: str):
-        date_parser_result = search_dates(text)
-        if not date_parser_result:
-            return []
-        cleaned_results = []
-
-        for date_text, date_time in date_parser_result:
-            # if len(date_text) < 4:
-            #     continue
-            if not self.classifier.predict_entities(date_text, ["date"]):
-                continue
-            cleaned_results.append((date_text, date_time))
-
-        occurrences = {}
-        entities = []
-        end_index = 0
-        for date_text, date_time in cleaned_results:
-            if date_text not in occurrences:
-                occurrences[date_text] = 0
-            occurrences[date_text] += 1
-            start_index = text.find(date_text, end_index)
-            end_index = start_index + len(date_text)
-
-            entities.append({"text": date_text, "entity_label": "DATE", "start_index": start_index, "end_index": end_index})
-        return entities
-
-    def process_segment(self, pdf_words, segment_box, total_entity_count) -> list[EntityBox]:
-        segment_bounding_box = Rectangle.from_width_height(
-            segment_box["left"], segment_box["top"], segment_box["width"], segment_box["height"]
-        )
-        word_boxes_for_page = pdf_words.pdf_words[segment_box["page_number"] - 1]
-        word_boxes_in_segment: list[WordBox] = WordBox.find_word_boxes_in_rectangle(
-            segment_bounding_box, word_boxes_for_page
-        )
-
-        labels = ["date"]
-        entities = []
-        window_size = 20
-        slide_size = 10
-        last_slide_end_index = 0
-
-        for i in range(0, len(word_boxes_in_segment), slide_size):
-            window_word_boxes = word_boxes_in_segment[i : i + window_size]
-            window_text = " ".join([wb.text for wb in window_word_boxes])
-            window_entities = self.classifier.predict_entities(window_text, labels)
+    def verify_date_texts(self, date_texts: list[str]):
+        unverified_date_texts = list(dict.fromkeys(t for t in date_texts if t not in self.verified_date_texts))
+        if not unverified_date_texts:
+            return
+        predictions = self.window_predictor.predict_window_texts(unverified_date_texts)
+        for date_text, entities in zip(unverified_date_texts, predictions):
+            self.verified_date_texts[date_text] = bool(entities)
+
+    def get_date_parser_predictions_from_texts(self, texts: list[str]) -> list[list[dict]]:
+        date_parser_results = [find_dates(text, self.date_languages) for text in texts]
+        self.verify_date_texts([date_text for result in date_parser_results for date_text, _ in result])
+
+        entities_by_text = []
+        for text, date_parser_result in zip(texts, date_parser_results):
+            cleaned_results = [
+                (date_text, date_time) for date_text, date_time in date_parser_result if self.verified_date_texts[date_text]
+            ]
+
+            entities = []
+            end_index = 0
+            for date_text, date_time in cleaned_results:
+                start_index = text.find(date_text, end_index)
+                end_index = start_index + len(date_text)
+                entities.append(
+                    {"text": date_text, "entity_label": "DATE", "start_index": start_index, "end_index": end_index}
+                )
+            entities_by_text.append(entities)
+        return entities_by_text
 
-            for entity in window_entities:
-                entity["start"] += last_slide_end_index
-                entity["end"] += last_slide_end_index
-
-            slide_window_boxes = word_boxes_in_segment[i : i + slide_size]
-            slide_text = " ".join([wb.text for wb in slide_window_boxes])
-            last_slide_end_index += len(slide_text) + 1
+    def get_date_parser_predictions(self, text: str):
+        return self.get_date_parser_predictions_from_texts([text])[0]
 
-            entities.extend(window_entities)
+    def predict_texts(self, texts: list[str]) -> list[list[dict]]:
+        labels = set(self.window_predictor.labels)
+        return self.predict_with_result_cache(texts, self.window_predictor.predict_texts, labels)
 
+    def create_segment_entity_boxes(self, segment_text: SegmentText, entities: list[dict]) -> list[EntityBox]:
         aggregated_entities = [
             {
                 "text": entity["text"],
@@ -128,19 +132,18 @@ class GLiNERDateParserModel(NERTransformerModel):
         aggregated_entities = self.get_parseable_entities(aggregated_entities)
         aggregated_entities = self.remove_overlapping_entities(aggregated_entities)
 
-        # full_text = " ".join([wb.text for wb in word_boxes_in_segment])
+        # full_text = segment_text.text
         # cleaned_text = self.remove_found_dates_from_text(full_text, aggregated_entities)
         # date_parser_entities = self.get_date_parser_predictions(cleaned_text)
         # aggregated_entities.extend(date_parser_entities)
 
-        # print("PAGE: ", segment_box["page_number"])
-        # print_with_line_breaks(" ".join([wb.text for wb in word_boxes_in_segment]))
+        # print("PAGE: ", segment_text.segment_box["page_number"])
+        # print_with_line_breaks(segment_text.text)
         # print("-" * 30)
         # print("\n".join([str(r) for r in aggregated_entities]))
         # print("*" * 30)
 
-        total_entity_count += len(aggregated_entities)
-        return self.create_entity_boxes(aggregated_entities, segment_box, word_boxes_in_segment)
+        return self.create_entity_boxes(aggregated_entities, segment_text)
 
 
 if __name__ == "__main__":
@@ -1,11 +1,15 @@
 import json
 from time import time
 
-from gliner import GLiNER
-from pdf_features.Rectangle import Rectangle
+import gliner
+
 from data_model.EntityBox import EntityBox
-from data_model.WordBox import WordBox
+from data_model.SegmentFilter import SegmentFilter
+from data_model.SegmentText import SegmentText
+from methods.GLiNERWindowPredictor import GLiNERWindowPredictor
+from methods.NERResultCache import NERResultCache
 from methods.NERTransformerModel import NERTransformerModel
+from model_registry import get_gliner_model
 
 
 def print_with_line_breaks(text, line_length=150):
@@ -14,11 +18,28 @@ def print_with_line_breaks(text, line_length=150):
 
 
 class GLiNERModel(NERTransformerModel):
-    def __init__(self, model_name: str, show_logs: bool = False):
-        super().__init__(model_name, show_logs, initialize_auto_model=False)
+    def __init__(
+        self,
+        model_name: str,
+        show_logs: bool = False,
+        batch_size: int = 32,
+        segment_filter: SegmentFilter = None,
+        use_result_cache: bool = True,
+    ):
+        super().__init__(
+            model_name,
+            show_logs,
+            initialize_auto_model=False,
+            segment_filter=segment_filter,
+            use_result_cache=use_result_cache,
+        )
         self.model_name = model_name + "_law_references"
-        self.classifier = GLiNER.from_pretrained(model_name)
+        self.classifier = get_gliner_model(model_name)
         self.show_logs = show_logs
+        self.window_predictor = GLiNERWindowPredictor(self.classifier, ["law", "cardinal"], batch_size=batch_size)
+        if use_result_cache:
+            settings = self.window_predictor.get_settings()
+            self.result_cache = NERResultCache(f"gliner:{model_name}", gliner.__version__, settings)
 
     @staticmethod
     def find_unique_dicts(dict_list: list[dict]) -> list[dict]:
@@ -42,36 +63,11 @@ class GLiNERModel(NERTransformerModel):
 
         return result
 
-    def process_segment(self, pdf_words, segment_box, total_entity_count) -> list[EntityBox]:
-        segment_bounding_box = Rectangle.from_width_height(
-            segment_box["left"], segment_box["top"], segment_box["width"], segment_box["height"]
-        )
-        word_boxes_for_page = pdf_words.pdf_words[segment_box["page_number"] - 1]
-        word_boxes_in_segment: list[WordBox] = WordBox.find_word_boxes_in_rectangle(
-            segment_bounding_box, word_boxes_for_page
-        )
-
-        labels = ["law", "cardinal"]
-        entities = []
-        window_size = 20
-        slide_size = 10
-        last_slide_end_index = 0
-
-        for i in range(0, len(word_boxes_in_segment), slide_size):
-            window_word_boxes = word_boxes_in_segment[i : i + window_size]
-            window_text = " ".join([wb.text for wb in window_word_boxes])
-            window_entities = self.classifier.predict_entities(window_text, labels)
-
-            for entity in window_entities:
-                entity["start"] += last_slide_end_index
-                entity["end"] += last_slide_end_index
-
-            slide_window_boxes = word_boxes_in_segment[i : i + slide_size]
-            slide_text = " ".join([wb.text for wb in slide_window_boxes])
-            last_slide_end_index += len(slide_text) + 1
-
-            entities.extend(window_entities)
+    def predict_texts(self, texts: list[str]) -> list[list[dict]]:
+        labels = set(self.window_predictor.labels)
+        return self.predict_with_result_cache(texts, self.window_predictor.predict_texts, labels)
 
+    def create_segment_entity_boxes(self, segment_text: SegmentText, entities: list[dict]) -> list[EntityBox]:
         aggregated_entities = [
             {
                 "text": entity["text"],
@@ -85,14 +81,13 @@ class GLiNERModel(NERTransformerModel):
         aggregated_entities = self.find_unique_dicts(aggregated_entities)
         aggregated_entities = self.remove_overlapping_entities(aggregated_entities)
 
-        print("PAGE: ", segment_box["page_number"])
-        print_with_line_breaks(" ".join([wb.text for wb in word_boxes_in_segment]))
+        print("PAGE: ", segment_text.segment_box["page_number"])
+        print_with_line_breaks(segment_text.text)
         print("-" * 30)
         print("\n".join([str(r) for r in aggregated_entities]))
         print("*" * 30)
 
-        total_entity_count += len(aggregated_entities)
-        return self.create_entity_boxes(aggregated_entities, segment_box, word_boxes_in_segment)
+        return self.create_entity_boxes(aggregated_entities, segment_text)
 
 
 if __name__ == "__main__":
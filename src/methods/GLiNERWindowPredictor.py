@@ -0,0 +1,89 @@
+from gliner import GLiNER
+
+
+class GLiNERWindowPredictor:
+    def __init__(self, classifier: GLiNER, labels: list[str], token_budget: int = 256, batch_size: int = 32):
+        self.classifier = classifier
+        self.labels = labels
+        self.token_budget = token_budget
+        self.batch_size = batch_size
+        self.words_splitter = classifier.data_processor.words_splitter
+        self.transformer_tokenizer = classifier.data_processor.transformer_tokenizer
+        self.max_word_tokens: int = classifier.config.max_len
+        self.overlap_word_tokens: int = classifier.config.max_width - 1
+        self.token_counts: dict[str, tuple[int, int]] = {}
+
+    def get_settings(self) -> dict:
+        return {
+            "token_budget": self.token_budget,
+            "max_word_tokens": self.max_word_tokens,
+            "overlap_word_tokens": self.overlap_word_tokens,
+        }
+
+    def get_token_counts(self, word: str) -> tuple[int, int]:
+        if word not in self.token_counts:
+            word_tokens = [token for token, _, _ in self.words_splitter(word)]
+            subword_count = sum(len(self.transformer_tokenizer.tokenize(token)) for token in word_tokens)
+            self.token_counts[word] = (len(word_tokens), subword_count)
+        return self.token_counts[word]
+
+    def get_window_ranges(self, words: list[str]) -> list[tuple[int, int]]:
+        token_counts = [self.get_token_counts(word) for word in words]
+        window_ranges = []
+        start = 0
+        while start < len(words):
+            end = start
+            word_token_count = subword_count = 0
+            while end < len(words):
+                word_token_count += token_counts[end][0]
+                subword_count += token_counts[end][1]
+                if end > start and (word_token_count > self.max_word_tokens or subword_count > self.token_budget):
+                    break
+                end += 1
+            window_ranges.append((start, end))
+            if end == len(words):
+                break
+
+            next_start = end
+            overlap_word_tokens = 0
+            while next_start > start + 1 and overlap_word_tokens < self.overlap_word_tokens:
+                next_start -= 1
+                overlap_word_tokens += token_counts[next_start][0]
+            start = next_start
+        return window_ranges
+
+    def get_windows(self, words: list[str]) -> list[tuple[int, str]]:
+        word_start_indices = []
+        start_index = 0
+        for word in words:
+            word_start_indices.append(start_index)
+            start_index += len(word) + 1
+
+        return [(word_start_indices[start], " ".join(words[start:end])) for start, end in self.get_window_ranges(words)]
+
+    def predict_window_texts(self, window_texts: list[str]) -> list[list[dict]]:
+        predictions: list[list[dict]] = []
+        for i in range(0, len(window_texts), self.batch_size):
+            predictions.extend(self.classifier.batch_predict_entities(window_texts[i : i + self.batch_size], self.labels))
+        return predictions
+
+    def predict(self, texts_words: list[list[str]]) -> list[list[dict]]:
+        unique_texts_words = list(dict.fromkeys(tuple(words) for words in texts_words))
+        windows = [
+            (text_index, window)
+            for text_index, words in enumerate(unique_texts_words)
+            for window in self.get_windows(list(words))
+        ]
+        predictions = self.predict_window_texts([window_text for _, (_, window_text) in windows])
+
+        entities_by_unique_text: list[list[dict]] = [[] for _ in unique_texts_words]
+        for (text_index, (window_start_index, _)), window_entities in zip(windows, predictions):
+            for entity in window_entities:
+                entity["start"] += window_start_index
+                entity["end"] += window_start_index
+            entities_by_unique_text[text_index].extend(window_entities)
+        entities_by_text = dict(zip(unique_texts_words, entities_by_unique_text))
+        return [[dict(entity) for entity in entities_by_text[tuple(words)]] for words in texts_words]
+
+    def predict_texts(self, texts: list[str]) -> list[list[dict]]:
+        return self.predict([text.split(" ") if text else [] for text in texts])
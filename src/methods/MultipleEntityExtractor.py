@@ -1,20 +1,58 @@
 import json
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from os import cpu_count
 from time import time
 
-import spacy
-from dateparser.search import search_dates
-from flair.data import Sentence
-from flair.nn import Classifier
-from gliner import GLiNER
-from configuration import CACHED_DATA_PATH
+import torch
+from date_normalization import DATE_LANGUAGES, find_dates, print_cache_stats
+from data_model.SegmentFilter import SegmentFilter
+from layout_analysis_cache import load_segment_boxes
+from methods.FlairBatchPredictor import FlairBatchPredictor
+from methods.GLiNERWindowPredictor import GLiNERWindowPredictor
+from methods.SpacyBatchPredictor import SpacyBatchPredictor
+from model_registry import get_flair_model, get_gliner_model, get_spacy_model, print_load_reports
+
+OPENNYAI_LABELS = {"PROVISION", "STATUTE", "CASE_NUMBER", "COURT", "PRECEDENT"}
+FLAIR_TAGS = {"ORG", "PERSON", "LAW", "GPE"}
 
 
 class MultipleEntityExtractor:
-    def __init__(self):
-        self.gliner_model = GLiNER.from_pretrained("urchade/gliner_multi-v2.1")
-        self.opennyai_model = spacy.load("en_legal_ner_sm")
-        self.flair_model = Classifier.load("ner-ontonotes-large")
+    def __init__(
+        self,
+        batch_size: int = 32,
+        mini_batch_size: int = 32,
+        spacy_batch_size: int = 64,
+        n_process: int = 1,
+        worker_count: int = 1,
+        torch_thread_count: int = None,
+        segment_filter: SegmentFilter = None,
+        date_languages: tuple[str, ...] = DATE_LANGUAGES,
+    ):
+        self.batch_size = batch_size
+        self.mini_batch_size = mini_batch_size
+        self.spacy_batch_size = spacy_batch_size
+        self.n_process = n_process
+        self.worker_count = worker_count
+        self.torch_thread_count = torch_thread_count or max(1, (cpu_count() or 1) // worker_count)
+        self.segment_filter = segment_filter or SegmentFilter()
+        self.date_languages = date_languages
+        if worker_count > 1 and n_process > 1:
+            raise ValueError("n_process > 1 cannot be combined with worker_count > 1")
+
+    @cached_property
+    def date_window_predictor(self) -> GLiNERWindowPredictor:
+        gliner_model = get_gliner_model("urchade/gliner_multi-v2.1")
+        return GLiNERWindowPredictor(gliner_model, ["date"], batch_size=self.batch_size)
+
+    @cached_property
+    def opennyai_predictor(self) -> SpacyBatchPredictor:
+        return SpacyBatchPredictor(get_spacy_model("en_legal_ner_sm"), self.spacy_batch_size, self.n_process)
+
+    @cached_property
+    def flair_predictor(self) -> FlairBatchPredictor:
+        return FlairBatchPredictor(get_flair_model("ner-ontonotes-large"), self.mini_batch_size)
 
     @staticmethod
     def find_unique_entity_dicts(entities: list[dict]) -> list[dict]:
@@ -35,36 +73,33 @@ class MultipleEntityExtractor:
 
         return result
 
-    def extract_date_entities(self, words: list[str]):
-
-        entities = []
-        window_size = 20
-        slide_size = 10
-        last_slide_end_index = 0
-
-        for i in range(0, len(words), slide_size):
-            window_words = words[i : i + window_size]
-            window_text = " ".join(window_words)
-            window_entities = self.gliner_model.predict_entities(window_text, ["date"])
-
-            for entity in window_entities:
-                entity["start"] += last_slide_end_index
-                entity["end"] += last_slide_end_index
-
-            slide_words = words[i : i + slide_size]
-            slide_text = " ".join(slide_words)
-            last_slide_end_index += len(slide_text) + 1
-            entities.extend(window_entities)
-
+    def get_date_times(self, entities: list[dict]):
         entities = self.find_unique_entity_dicts(entities)
-        entities = [e for e in entities if search_dates(e["text"])]
+        entities = [e for e in entities if find_dates(e["text"], self.date_languages)]
         entities = self.remove_overlapping_entities(entities, "start", "end")
-        date_times = [d[1] for e in entities for d in search_dates(e["text"])]
+        date_times = [d[1] for e in entities for d in find_dates(e["text"], self.date_languages)]
         return date_times
 
-    def extract_entities_from_text(self, text: str):
-        words = text.split()
-        date_times = self.extract_date_entities(words)
+    def extract_date_entities(self, words: list[str]):
+        return self.extract_date_entities_from_texts([words])[0]
+
+    def extract_date_entities_from_texts(self, texts_words: list[list[str]]):
+        entities_by_text = self.date_window_predictor.predict(texts_words)
+        return [self.get_date_times(entities) for entities in entities_by_text]
+
+    def extract_entities_from_text(
+        self,
+        text: str,
+        date_times: list = None,
+        flair_entities: list[dict] = None,
+        opennyai_entities: list[dict] = None,
+    ):
+        if date_times is None:
+            date_times = self.extract_date_entities(text.split())
+        if opennyai_entities is None:
+            opennyai_entities = self.opennyai_predictor.predict([text], OPENNYAI_LABELS)[0]
+        if flair_entities is None:
+            flair_entities = self.flair_predictor.predict([text], FLAIR_TAGS)[0]
         date_strings = [d.date() for d in date_times]
 
         entities = []
@@ -72,52 +107,54 @@ class MultipleEntityExtractor:
         for date_string in date_strings:
             entities.append([date_string, "DATE"])
 
-        opennyai_result = self.opennyai_model(text)
-        entity_results = []
-        for entity in opennyai_result.ents:
-            if entity.label_ not in {"PROVISION", "STATUTE", "CASE_NUMBER", "COURT", "PRECEDENT"}:
-                continue
-
-            entity_results.append(
-                {
-                    "text": entity.text,
-                    "entity_label": entity.label_,
-                    "start_index": entity.start_char,
-                    "end_index": entity.end_char,
-                }
-            )
-
-        sentence = Sentence(text)
-        self.flair_model.predict(sentence)
-        flair_result = sentence.get_spans("ner")
-
-        for entity in flair_result:
-            if entity.tag not in {"ORG", "PERSON", "LAW", "GPE"}:
-                continue
-            entity_results.append(
-                {
-                    "text": entity.text,
-                    "entity_label": entity.tag,
-                    "start_index": entity.start_position,
-                    "end_index": entity.end_position,
-                }
-            )
+        entity_results = list(opennyai_entities)
+        entity_results.extend(flair_entities)
 
         entity_results = self.remove_overlapping_entities(entity_results)
         for entity in entity_results:
             entities.append([entity["text"], entity["entity_label"]])
         return entities
 
+    def predict_model_entities(self, texts: list[str]) -> tuple[list, list[list[dict]], list[list[dict]]]:
+        predictions = [
+            lambda: self.extract_date_entities_from_texts([text.split() for text in texts]),
+            lambda: self.flair_predictor.predict(texts, FLAIR_TAGS),
+            lambda: self.opennyai_predictor.predict(texts, OPENNYAI_LABELS),
+        ]
+        if self.worker_count <= 1:
+            return tuple(predict() for predict in predictions)
+
+        previous_torch_thread_count = torch.get_num_threads()
+        torch.set_num_threads(self.torch_thread_count)
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.worker_count, len(predictions))) as executor:
+                futures = [executor.submit(predict) for predict in predictions]
+                return tuple(future.result() for future in futures)
+        finally:
+            torch.set_num_threads(previous_torch_thread_count)
+
     def extract_entities(self, pdf_name: str):
-        segment_boxes: list[dict] = json.loads((CACHED_DATA_PATH / f"{pdf_name}.json").read_text())
+        segment_boxes: list[dict] = self.segment_filter.filter(load_segment_boxes(pdf_name))
         # entities_by_page = {}
         # entities_dict = defaultdict(lambda: defaultdict(set))
         # entities_dict = defaultdict(lambda: defaultdict(lambda: {"pages": set(), "mentions": set(), "mention_starts": []}))
         entities_dict = defaultdict(lambda: defaultdict(lambda: {"pages": set(), "mentions": set()}))
 
-        for segment_box in segment_boxes:
-            reconstructed_text = " ".join([word for word in segment_box["text"].split()])
-            segment_entities = self.extract_entities_from_text(reconstructed_text)
+        reconstructed_texts = [" ".join([word for word in segment_box["text"].split()]) for segment_box in segment_boxes]
+        date_times_by_segment, flair_entities_by_segment, opennyai_entities_by_segment = self.predict_model_entities(
+            reconstructed_texts
+        )
+
+        for segment_box, reconstructed_text, date_times, flair_entities, opennyai_entities in zip(
+            segment_boxes,
+            reconstructed_texts,
+            date_times_by_segment,
+            flair_entities_by_segment,
+            opennyai_entities_by_segment,
+        ):
+            segment_entities = self.extract_entities_from_text(
+                reconstructed_text, date_times, flair_entities, opennyai_entities
+            )
             # entities_by_page.setdefault(segment_box["page_number"], []).extend(segment_entities)
             for entity_text, entity_label in segment_entities:
                 entities_dict[entity_label][entity_text]["pages"].add(segment_box["page_number"])
@@ -156,5 +193,7 @@ if __name__ == "__main__":
     entities_dict = extractor.extract_entities("cejil_staging33")
     print("Extraction finished in", round(time() - start, 2), "seconds")
     extractor.print_formatted_entities(entities_dict)
+    print_load_reports()
+    print_cache_stats()
     # Extraction finished in 120.88 seconds
     # Extraction finished in 117 seconds (mentions added)
@@ -0,0 +1,143 @@
+import json
+import sqlite3
+from collections import OrderedDict
+from hashlib import sha256
+from pathlib import Path
+from threading import Lock
+from typing import Callable
+
+from configuration import NER_RESULTS_CACHE_PATH
+
+SCHEMA_VERSION = 1
+
+
+class NERResultCache:
+    def __init__(
+        self,
+        model_id: str,
+        revision: str = "",
+        settings: dict = None,
+        max_size: int = 4096,
+        database_path: Path = NER_RESULTS_CACHE_PATH,
+    ):
+        self.model_id = model_id
+        self.revision = revision
+        self.settings_key = json.dumps(settings or {}, sort_keys=True)
+        self.max_size = max_size
+        self.memory_cache: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self.memory_hits = 0
+        self.database_hits = 0
+        self.misses = 0
+        self.lock = Lock()
+        self.connection = sqlite3.connect(database_path, check_same_thread=False)
+        self.create_table(database_path)
+
+    def create_table(self, database_path: Path):
+        schema_version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        table_count = self.connection.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'").fetchone()[0]
+        if table_count and schema_version != SCHEMA_VERSION:
+            raise RuntimeError(
+                f"{database_path} has NER result cache schema version {schema_version}, expected {SCHEMA_VERSION}. "
+                "Move or delete it to start a new cache."
+            )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS ner_results ("
+            "model_id TEXT, revision TEXT, settings TEXT, labels TEXT, text_hash TEXT, entities TEXT, "
+            "PRIMARY KEY (model_id, revision, settings, labels, text_hash))"
+        )
+        self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.connection.commit()
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        return " ".join(text.split())
+
+    @staticmethod
+    def get_labels_key(labels: set[str] = None) -> str:
+        return ",".join(sorted(labels)) if labels else ""
+
+    @staticmethod
+    def get_text_hash(text: str) -> str:
+        return sha256(NERResultCache.normalize_text(text).encode()).hexdigest()
+
+    def get_from_database(self, labels_key: str, text_hashes: list[str]) -> dict[str, str]:
+        entities_by_hash = {}
+        for start in range(0, len(text_hashes), 500):
+            chunk = text_hashes[start : start + 500]
+            rows = self.connection.execute(
+                "SELECT text_hash, entities FROM ner_results "
+                "WHERE model_id = ? AND revision = ? AND settings = ? AND labels = ? "
+                f"AND text_hash IN ({','.join('?' * len(chunk))})",
+                [self.model_id, self.revision, self.settings_key, labels_key, *chunk],
+            )
+            entities_by_hash.update(rows.fetchall())
+        return entities_by_hash
+
+    def add_to_memory(self, key: tuple[str, str], entities_json: str):
+        self.memory_cache[key] = entities_json
+        self.memory_cache.move_to_end(key)
+        while len(self.memory_cache) > self.max_size:
+            self.memory_cache.popitem(last=False)
+
+    def get(self, texts: list[str], labels: set[str] = None) -> list[str | None]:
+        labels_key = self.get_labels_key(labels)
+        keys = [(labels_key, self.get_text_hash(text)) for text in texts]
+        with self.lock:
+            entities_jsons = []
+            for key in keys:
+                entities_json = self.memory_cache.get(key)
+                if entities_json is not None:
+                    self.memory_cache.move_to_end(key)
+                entities_jsons.append(entities_json)
+            missing_hashes = list(
+                dict.fromkeys(key[1] for key, entities_json in zip(keys, entities_jsons) if entities_json is None)
+            )
+            entities_by_hash = self.get_from_database(labels_key, missing_hashes) if missing_hashes else {}
+            for text_hash, entities_json in entities_by_hash.items():
+                self.add_to_memory((labels_key, text_hash), entities_json)
+
+            for index, key in enumerate(keys):
+                if entities_jsons[index] is not None:
+                    self.memory_hits += 1
+                elif key[1] in entities_by_hash:
+                    entities_jsons[index] = entities_by_hash[key[1]]
+                    self.database_hits += 1
+                else:
+                    self.misses += 1
+        return entities_jsons
+
+    @staticmethod
+    def to_json(entities: list[dict]) -> str:
+        return json.dumps(entities, default=lambda value: value.item())
+
+    def put(self, texts: list[str], entities_jsons: list[str], labels: set[str] = None):
+        labels_key = self.get_labels_key(labels)
+        rows = []
+        with self.lock:
+            for text, entities_json in zip(texts, entities_jsons):
+                text_hash = self.get_text_hash(text)
+                self.add_to_memory((labels_key, text_hash), entities_json)
+                rows.append((self.model_id, self.revision, self.settings_key, labels_key, text_hash, entities_json))
+            self.connection.executemany("INSERT OR REPLACE INTO ner_results VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self.connection.commit()
+
+    def get_or_predict(
+        self, texts: list[str], predict: Callable[[list[str]], list[list[dict]]], labels: set[str] = None
+    ) -> list[list[dict]]:
+        cacheable_texts = [text for text in texts if text == self.normalize_text(text)]
+        entities_json_by_text = dict(zip(cacheable_texts, self.get(cacheable_texts, labels)))
+        missing_texts = list(dict.fromkeys(text for text in texts if entities_json_by_text.get(text) is None))
+        if missing_texts:
+            predicted_jsons = [self.to_json(entities) for entities in predict(missing_texts)]
+            entities_json_by_text.update(zip(missing_texts, predicted_jsons))
+            cacheable_missing_texts = [text for text in missing_texts if text == self.normalize_text(text)]
+            self.put(cacheable_missing_texts, [entities_json_by_text[text] for text in cacheable_missing_texts], labels)
+        return [json.loads(entities_json_by_text[text]) for text in texts]
+
+    def print_stats(self):
+        lookup_count = self.memory_hits + self.database_hits + self.misses
+        hit_rate = round(100 * (self.memory_hits + self.database_hits) / lookup_count, 2) if lookup_count else 0
+        print(
+            f"NER RESULT CACHE {self.model_id}: {self.memory_hits} memory hits, {self.database_hits} database hits,",
+            f"{self.misses} misses ({hit_rate}% hit rate)",
+        )
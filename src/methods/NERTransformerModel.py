@@ -1,25 +1,71 @@
-import json
-from pdf_features.Rectangle import Rectangle
-from transformers import AutoTokenizer, AutoModelForTokenClassification, pipeline
+from typing import Callable
+
 from data_model.EntityBox import EntityBox
+from data_model.DocumentTextIndex import DocumentTextIndex
 from data_model.PdfWords import PdfWords
+from data_model.SegmentFilter import SegmentFilter
+from data_model.SegmentText import SegmentText
 from data_model.WordBox import WordBox
 from save_visualization_to_pdf import save_output_to_pdf
-from configuration import CACHED_DATA_PATH, PDFS_PATH
+from configuration import PDFS_PATH
+from layout_analysis_cache import load_segment_boxes
+from methods.NERResultCache import NERResultCache
+from methods.TransformersBatchPredictor import TransformersBatchPredictor
+from model_registry import get_token_classification_pipeline
 
 
 class NERTransformerModel:
-    def __init__(self, model_name: str, show_logs: bool = False, initialize_auto_model: bool = True):
+    hub_model_name: str | None = None
+    aggregation_strategy: str | None = None
+
+    def __init__(
+        self,
+        model_name: str,
+        show_logs: bool = False,
+        initialize_auto_model: bool = True,
+        batch_size: int = 16,
+        stride: int = 64,
+        backend: str = "torch",
+        quantize: bool = False,
+        segment_filter: SegmentFilter = None,
+        use_result_cache: bool = True,
+    ):
         self.model_name = model_name
         self.show_logs = show_logs
+        self.batch_size = batch_size
+        self.stride = stride
+        self.backend = backend
+        self.quantize = quantize
+        self.segment_filter = segment_filter or SegmentFilter()
         self.classifier = None
+        self.transformers_predictor: TransformersBatchPredictor | None = None
+        self.use_result_cache = use_result_cache
+        self.result_cache: NERResultCache | None = None
         if initialize_auto_model:
             self.initialize_auto_model()
 
     def initialize_auto_model(self):
-        tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-        model = AutoModelForTokenClassification.from_pretrained(self.model_name)
-        self.classifier = pipeline("ner", model=model, tokenizer=tokenizer)
+        hub_model_name = self.hub_model_name or self.model_name
+        self.classifier = get_token_classification_pipeline(
+            hub_model_name, self.aggregation_strategy, backend=self.backend, quantize=self.quantize
+        )
+        self.transformers_predictor = TransformersBatchPredictor(self.classifier, self.batch_size, self.stride)
+        if self.use_result_cache:
+            backend = f"{self.backend}-int8" if self.quantize else self.backend
+            revision = getattr(self.classifier.model.config, "_commit_hash", None) or ""
+            settings = {"stride": self.stride, "max_token_count": self.transformers_predictor.max_token_count}
+            self.result_cache = NERResultCache(f"{hub_model_name}:{backend}", revision, settings)
+
+    def predict_with_result_cache(
+        self, texts: list[str], predict: Callable[[list[str]], list[list[dict]]], labels: set[str] = None
+    ) -> list[list[dict]]:
+        if self.result_cache is None:
+            return predict(texts)
+        return self.result_cache.get_or_predict(texts, predict, labels)
+
+    def predict_texts(self, texts: list[str]) -> list[list[dict]]:
+        labels = set(self.classifier.model.config.id2label.values())
+        return self.predict_with_result_cache(texts, self.transformers_predictor.predict, labels)
 
     @staticmethod
     def aggregate_entities(ner_results: list[dict]):
@@ -70,11 +116,13 @@ class NERTransformerModel:
         return entities
 
     def get_entities(self, file_name: str, save_output: bool = False):
-        pdf_words: PdfWords = PdfWords.from_pdf_path(PDFS_PATH / f"{file_name}.pdf")
-        segment_boxes: list[dict] = json.loads((CACHED_DATA_PATH / f"{file_name}.json").read_text())
-        entity_boxes: list[EntityBox] = self.process_segments(pdf_words, segment_boxes)
+        pdf_words: PdfWords = PdfWords.from_pdf_path(PDFS_PATH / f"{file_name}.pdf", use_cache=True)
+        segment_boxes: list[dict] = load_segment_boxes(file_name)
+        entity_boxes: list[EntityBox] = self.process_segments(pdf_words, self.segment_filter.filter(segment_boxes))
         if self.show_logs:
             print("ENTITY BOX COUNT: ", len(entity_boxes))
+        if self.show_logs and self.result_cache is not None:
+            self.result_cache.print_stats()
         if save_output:
             self.save_visualizations(file_name, entity_boxes, segment_boxes)
 
@@ -84,41 +132,33 @@ class NERTransformerModel:
 
     def process_segments(self, pdf_words, segment_boxes) -> list[EntityBox]:
         entity_boxes: list[EntityBox] = []
-        total_entity_count = 0
-        for segment_box in segment_boxes:
-            segment_entities = self.process_segment(pdf_words, segment_box, total_entity_count)
-            entity_boxes.extend(segment_entities)
+        document_text_index = DocumentTextIndex.from_pdf_words(pdf_words, segment_boxes)
+        results = self.predict_texts([segment_text.text for segment_text in document_text_index])
+        for segment_text, result in zip(document_text_index, results):
+            entity_boxes.extend(self.create_segment_entity_boxes(segment_text, result))
         return entity_boxes
 
-    def process_segment(self, pdf_words, segment_box, total_entity_count) -> list[EntityBox]:
-        segment_bounding_box = Rectangle.from_width_height(
-            segment_box["left"], segment_box["top"], segment_box["width"], segment_box["height"]
-        )
-        word_boxes_for_page = pdf_words.pdf_words[segment_box["page_number"] - 1]
-        word_boxes_in_segment: list[WordBox] = WordBox.find_word_boxes_in_rectangle(
-            segment_bounding_box, word_boxes_for_page
-        )
-        result = self.classifier(" ".join([wb.text for wb in word_boxes_in_segment]))
-        aggregated_entities = NERTransformerModel.aggregate_entities(result)
+    def create_segment_entity_boxes(self, segment_text: SegmentText, result: list[dict]) -> list[EntityBox]:
+        aggregated_entities = self.aggregate_entities(result)
 
-        if segment_box["page_number"] == 1:
+        if segment_text.segment_box["page_number"] == 1:
             print("\n".join([str(r) for r in aggregated_entities]))
 
-        total_entity_count += len(aggregated_entities)
-        return self.create_entity_boxes(aggregated_entities, segment_box, word_boxes_in_segment)
+        return self.create_entity_boxes(aggregated_entities, segment_text)
 
-    def create_entity_boxes(self, aggregated_entities, segment_box, word_boxes_in_segment):
+    def create_entity_boxes(self, aggregated_entities, segment_text: SegmentText):
         entity_boxes: list[EntityBox] = []
-        for entity in aggregated_entities:
-            word_boxes_for_entity = WordBox.find_word_boxes_from_indices(
-                word_boxes_in_segment, entity["start_index"], entity["end_index"]
-            )
+        entity_spans = [(entity["start_index"], entity["end_index"]) for entity in aggregated_entities]
+        word_boxes_by_entity = WordBox.find_word_boxes_from_spans(
+            segment_text.word_boxes, entity_spans, segment_text.word_start_indices
+        )
+        for entity, word_boxes_for_entity in zip(aggregated_entities, word_boxes_by_entity):
             if not word_boxes_for_entity and self.show_logs:
                 print(
                     "NO WORD BOXES FOUND FOR ENTITY: ",
                     entity["text"],
                     entity["entity_label"],
-                    segment_box["page_number"],
+                    segment_text.segment_box["page_number"],
                     entity["start_index"],
                     entity["end_index"],
                 )
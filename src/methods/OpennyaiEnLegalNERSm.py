@@ -1,11 +1,12 @@
-import spacy
 from pathlib import Path
-from pdf_features.Rectangle import Rectangle
 
 from data_model.EntityBox import EntityBox
-from data_model.WordBox import WordBox
+from data_model.SegmentFilter import SegmentFilter
+from data_model.SegmentText import SegmentText
 from methods.NERTransformerModel import NERTransformerModel
+from methods.SpacyBatchPredictor import SpacyBatchPredictor
 from configuration import ROOT_PATH
+from model_registry import get_spacy_model
 
 
 def print_with_line_breaks(text, line_length=150):
@@ -14,39 +15,28 @@ def print_with_line_breaks(text, line_length=150):
 
 
 class OpennyaiEnLegalNERSm(NERTransformerModel):
-    def __init__(self, model_name: str = "opennyai_en_legal_ner_sm", show_logs: bool = False):
-        super().__init__(model_name, show_logs, initialize_auto_model=False)
+    def __init__(
+        self,
+        model_name: str = "opennyai_en_legal_ner_sm",
+        show_logs: bool = False,
+        batch_size: int = 64,
+        n_process: int = 1,
+        segment_filter: SegmentFilter = None,
+    ):
+        super().__init__(model_name, show_logs, initialize_auto_model=False, segment_filter=segment_filter)
         self.model_name = model_name
-        self.classifier = spacy.load(Path(ROOT_PATH, "opennyai_model", "en_legal_ner_sm", "en_legal_ner_sm-3.2.0"))
+        self.classifier = get_spacy_model(Path(ROOT_PATH, "opennyai_model", "en_legal_ner_sm", "en_legal_ner_sm-3.2.0"))
         self.show_logs = show_logs
+        self.spacy_predictor = SpacyBatchPredictor(self.classifier, batch_size, n_process)
 
-    def process_segment(self, pdf_words, segment_box, total_entity_count) -> list[EntityBox]:
-        segment_bounding_box = Rectangle.from_width_height(
-            segment_box["left"], segment_box["top"], segment_box["width"], segment_box["height"]
-        )
-        word_boxes_for_page = pdf_words.pdf_words[segment_box["page_number"] - 1]
-        word_boxes_in_segment: list[WordBox] = WordBox.find_word_boxes_in_rectangle(
-            segment_bounding_box, word_boxes_for_page
-        )
-
-        text = " ".join([wb.text for wb in word_boxes_in_segment])
-        print(f"PAGE: {segment_box['page_number']}")
-        print_with_line_breaks(text)
-        print("-" * 30)
+    def predict_texts(self, texts: list[str]) -> list[list[dict]]:
+        return self.spacy_predictor.predict(texts)
 
-        doc = self.classifier(text)
-        aggregated_entities = []
-        for entity in doc.ents:
-            aggregated_entities.append(
-                {
-                    "text": entity.text,
-                    "entity_label": entity.label_,
-                    "start_index": entity.start_char,
-                    "end_index": entity.end_char,
-                }
-            )
-        total_entity_count += len(aggregated_entities)
-        return self.create_entity_boxes(aggregated_entities, segment_box, word_boxes_in_segment)
+    def create_segment_entity_boxes(self, segment_text: SegmentText, aggregated_entities: list[dict]) -> list[EntityBox]:
+        print(f"PAGE: {segment_text.segment_box['page_number']}")
+        print_with_line_breaks(segment_text.text)
+        print("-" * 30)
+        return self.create_entity_boxes(aggregated_entities, segment_text)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,56 @@
+from spacy.language import Language
+
+UNUSED_COMPONENTS = {
+    "tagger",
+    "parser",
+    "attribute_ruler",
+    "lemmatizer",
+    "trainable_lemmatizer",
+    "morphologizer",
+    "senter",
+    "sentencizer",
+    "textcat",
+    "textcat_multilabel",
+    "spancat",
+}
+EMBEDDING_COMPONENTS = {"tok2vec", "transformer"}
+
+
+class SpacyBatchPredictor:
+    def __init__(self, nlp: Language, batch_size: int = 64, n_process: int = 1):
+        self.nlp = nlp
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.disabled_components = self.get_unused_components(nlp)
+
+    @staticmethod
+    def get_unused_components(nlp: Language) -> list[str]:
+        unused_components = [name for name in nlp.pipe_names if name in UNUSED_COMPONENTS]
+        used_components = set(nlp.pipe_names) - set(unused_components)
+        for name in nlp.pipe_names:
+            if name not in EMBEDDING_COMPONENTS or not hasattr(nlp.get_pipe(name), "listening_components"):
+                continue
+            listening_components = set(nlp.get_pipe(name).listening_components)
+            if not listening_components & (used_components - EMBEDDING_COMPONENTS):
+                unused_components.append(name)
+        return unused_components
+
+    @staticmethod
+    def get_entities(doc, labels: set[str] = None) -> list[dict]:
+        return [
+            {
+                "text": entity.text,
+                "entity_label": entity.label_,
+                "start_index": entity.start_char,
+                "end_index": entity.end_char,
+            }
+            for entity in doc.ents
+            if labels is None or entity.label_ in labels
+        ]
+
+    def predict(self, texts: list[str], labels: set[str] = None) -> list[list[dict]]:
+        unique_texts = list(dict.fromkeys(texts))
+        n_process = self.n_process if len(unique_texts) > self.batch_size else 1
+        docs = self.nlp.pipe(unique_texts, batch_size=self.batch_size, n_process=n_process, disable=self.disabled_components)
+        entities_by_text = {text: self.get_entities(doc, labels) for text, doc in zip(unique_texts, docs)}
+        return [[dict(entity) for entity in entities_by_text[text]] for text in texts]
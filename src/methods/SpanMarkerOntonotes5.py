@@ -1,26 +1,27 @@
-from pdf_features.Rectangle import Rectangle
 from span_marker import SpanMarkerModel
 
 from data_model.EntityBox import EntityBox
-from data_model.WordBox import WordBox
+from data_model.SegmentFilter import SegmentFilter
+from data_model.SegmentText import SegmentText
 from methods.NERTransformerModel import NERTransformerModel
 
 
 class SpanMarkerOntonotes5(NERTransformerModel):
-    def __init__(self, model_name: str, show_logs: bool = False, initialize_auto_model: bool = True):
-        super().__init__(model_name, show_logs, initialize_auto_model)
+    def __init__(
+        self,
+        model_name: str,
+        show_logs: bool = False,
+        initialize_auto_model: bool = True,
+        segment_filter: SegmentFilter = None,
+    ):
+        super().__init__(model_name, show_logs, initialize_auto_model, segment_filter=segment_filter)
         self.classifier = SpanMarkerModel.from_pretrained(model_name)
         self.classifier.cuda()
 
-    def process_segment(self, pdf_words, segment_box, total_entity_count) -> list[EntityBox]:
-        segment_bounding_box = Rectangle.from_width_height(
-            segment_box["left"], segment_box["top"], segment_box["width"], segment_box["height"]
-        )
-        word_boxes_for_page = pdf_words.pdf_words[segment_box["page_number"] - 1]
-        word_boxes_in_segment: list[WordBox] = WordBox.find_word_boxes_in_rectangle(
-            segment_bounding_box, word_boxes_for_page
-        )
-        result = self.classifier.predict(" ".join([wb.text for wb in word_boxes_in_segment]))
+    def predict_texts(self, texts: list[str]) -> list[list[dict]]:
+        return self.classifier.predict(texts) if texts else []
+
+    def create_segment_entity_boxes(self, segment_text: SegmentText, result: list[dict]) -> list[EntityBox]:
         aggregated_entities = []
         for r in result:
             aggregated_entities.append(
@@ -34,11 +35,10 @@ class SpanMarkerOntonotes5(NERTransformerModel):
 
         print(result)
 
-        if segment_box["page_number"] == 1:
+        if segment_text.segment_box["page_number"] == 1:
             print("\n".join([str(r) for r in aggregated_entities]))
 
-        total_entity_count += len(aggregated_entities)
-        return self.create_entity_boxes(aggregated_entities, segment_box, word_boxes_in_segment)
+        return self.create_entity_boxes(aggregated_entities, segment_text)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,88 @@
+from transformers import Pipeline
+
+
+class TransformersBatchPredictor:
+    def __init__(self, classifier: Pipeline, batch_size: int = 16, stride: int = 64):
+        self.classifier = classifier
+        self.batch_size = batch_size
+        self.stride = stride
+        self.max_token_count = self.get_max_token_count()
+
+    def get_max_token_count(self) -> int:
+        tokenizer = self.classifier.tokenizer
+        max_token_count = tokenizer.model_max_length
+        max_position_embeddings = getattr(self.classifier.model.config, "max_position_embeddings", None)
+        if max_position_embeddings:
+            max_token_count = min(max_token_count, max_position_embeddings)
+        return max_token_count - tokenizer.num_special_tokens_to_add()
+
+    def get_chunk_spans(self, text: str) -> list[tuple[int, int, int, int]]:
+        tokenizer = self.classifier.tokenizer
+        if not tokenizer.is_fast:
+            return [(0, len(text), 0, len(text))]
+        encoding = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True, truncation=False)
+        offsets = encoding["offset_mapping"]
+        if len(offsets) <= self.max_token_count:
+            return [(0, len(text), 0, len(text))]
+
+        word_ids = encoding.word_ids()
+        word_starts = [i for i in range(1, len(offsets)) if word_ids[i] != word_ids[i - 1]]
+
+        def get_last_word_start(first: int, last: int) -> int:
+            return max([word_start for word_start in word_starts if first < word_start <= last], default=last)
+
+        token_starts = [0]
+        token_ends = []
+        while token_starts[-1] + self.max_token_count < len(offsets):
+            token_start = token_starts[-1]
+            token_ends.append(get_last_word_start(token_start, token_start + self.max_token_count))
+            token_starts.append(get_last_word_start(token_start, token_start + self.max_token_count - self.stride))
+        token_ends.append(len(offsets))
+
+        chunk_spans = []
+        for chunk_index, (token_start, token_end) in enumerate(zip(token_starts, token_ends)):
+            keep_start = 0
+            keep_end = len(text)
+            if chunk_index > 0:
+                previous_end = token_ends[chunk_index - 1]
+                keep_start = offsets[(token_start + previous_end) // 2][0]
+            if chunk_index < len(token_starts) - 1:
+                next_start = token_starts[chunk_index + 1]
+                keep_end = offsets[(next_start + token_end) // 2][0]
+            chunk_spans.append((offsets[token_start][0], offsets[token_end - 1][1], keep_start, keep_end))
+        return chunk_spans
+
+    def predict(self, texts: list[str]) -> list[list[dict]]:
+        unique_texts = list(dict.fromkeys(texts))
+        results_by_text = dict(zip(unique_texts, self.predict_unique_texts(unique_texts)))
+        return [[dict(entity_dict) for entity_dict in results_by_text[text]] for text in texts]
+
+    def predict_unique_texts(self, texts: list[str]) -> list[list[dict]]:
+        results_by_text: list[list[dict]] = [[] for _ in texts]
+        chunks = [
+            (text_index, chunk_span)
+            for text_index, text in enumerate(texts)
+            if text
+            for chunk_span in self.get_chunk_spans(text)
+        ]
+        if not chunks:
+            return results_by_text
+
+        chunk_texts = [texts[text_index][chunk_start:chunk_end] for text_index, (chunk_start, chunk_end, _, _) in chunks]
+        chunk_order = sorted(range(len(chunks)), key=lambda i: len(chunk_texts[i]), reverse=True)
+
+        chunk_results: list[list[dict]] = [[] for _ in chunks]
+        results = self.classifier((chunk_texts[i] for i in chunk_order), batch_size=self.batch_size)
+        for chunk_index, result in zip(chunk_order, results):
+            chunk_results[chunk_index] = result
+
+        for (text_index, (chunk_start, _, keep_start, keep_end)), result in zip(chunks, chunk_results):
+            if (keep_start, keep_end) == (0, len(texts[text_index])):
+                results_by_text[text_index].extend(result)
+                continue
+            for entity_dict in result:
+                entity_dict["start"] += chunk_start
+                entity_dict["end"] += chunk_start
+                if keep_start <= entity_dict["start"] < keep_end:
+                    results_by_text[text_index].append(entity_dict)
+        return results_by_text
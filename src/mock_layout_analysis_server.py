@@ -0,0 +1,62 @@
+import json
+import tempfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+from time import sleep, time
+
+from cache_data import cache_layout_analysis
+
+MOCK_SEGMENT_BOXES = [
+    {
+        "left": 72,
+        "top": 72,
+        "width": 468,
+        "height": 40,
+        "page_number": 1,
+        "page_width": 612,
+        "page_height": 792,
+        "text": "Mock segment",
+        "type": "Text",
+    }
+]
+
+
+def get_request_handler(latency: float):
+    class MockLayoutAnalysisHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            sleep(latency)
+            body = json.dumps(MOCK_SEGMENT_BOXES).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MockLayoutAnalysisHandler
+
+
+def start_mock_server(port: int = 5061, latency: float = 1.0) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("localhost", port), get_request_handler(latency))
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def benchmark_cache_layout_analysis(worker_counts: list[int], port: int = 5061, latency: float = 1.0):
+    server = start_mock_server(port, latency)
+    for worker_count in worker_counts:
+        with tempfile.TemporaryDirectory() as output_path:
+            start = time()
+            cache_layout_analysis(worker_count, f"http://localhost:{port}", output_path=Path(output_path))
+            print(f"WORKERS: {worker_count}, finished in", round(time() - start, 2), "seconds")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    benchmark_cache_layout_analysis([1, 4, 8, 16])
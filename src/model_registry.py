@@ -0,0 +1,103 @@
+import resource
+from os import sysconf
+from pathlib import Path
+from threading import RLock
+from time import time
+from typing import Any, Callable
+
+from data_model.ModelLoadReport import ModelLoadReport
+from onnx_model_cache import load_onnx_token_classification_model
+
+MEGABYTE = 1024 * 1024
+
+registry_lock = RLock()
+models: dict[str, Any] = {}
+load_reports: dict[str, ModelLoadReport] = {}
+
+
+def get_resident_memory() -> int:
+    statm_path = Path("/proc/self/statm")
+    if statm_path.exists():
+        return int(statm_path.read_text().split()[1]) * sysconf("SC_PAGE_SIZE")
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def get_parameter_memory(model) -> int | None:
+    torch_module = getattr(model, "model", model)
+    if not hasattr(torch_module, "parameters"):
+        return None
+    return sum(parameter.numel() * parameter.element_size() for parameter in torch_module.parameters())
+
+
+def get_model(model_key: str, loader: Callable[[], Any]):
+    if model_key in models:
+        return models[model_key]
+    with registry_lock:
+        if model_key in models:
+            return models[model_key]
+        resident_memory = get_resident_memory()
+        start = time()
+        model = loader()
+        parameter_memory = get_parameter_memory(model)
+        load_reports[model_key] = ModelLoadReport(
+            model_key=model_key,
+            load_seconds=round(time() - start, 2),
+            resident_memory_mb=round((get_resident_memory() - resident_memory) / MEGABYTE, 1),
+            parameter_memory_mb=None if parameter_memory is None else round(parameter_memory / MEGABYTE, 1),
+        )
+        print(f"MODEL LOADED {load_reports[model_key]}")
+        models[model_key] = model
+        return model
+
+
+def get_gliner_model(model_name: str):
+    from gliner import GLiNER
+
+    return get_model(f"gliner:{model_name}", lambda: GLiNER.from_pretrained(model_name))
+
+
+def get_flair_model(model_name: str):
+    from flair.nn import Classifier
+
+    return get_model(f"flair:{model_name}", lambda: Classifier.load(model_name))
+
+
+def get_spacy_model(model_name: str | Path):
+    import spacy
+
+    return get_model(f"spacy:{model_name}", lambda: spacy.load(model_name))
+
+
+def get_token_classification_pipeline(
+    model_name: str, aggregation_strategy: str = None, backend: str = "torch", quantize: bool = False
+):
+    from transformers import AutoModelForTokenClassification, AutoTokenizer, pipeline
+
+    if backend not in {"torch", "onnx"}:
+        raise ValueError(f"Unknown inference backend: {backend}")
+
+    def load_pipeline():
+        if backend == "onnx":
+            model, tokenizer = load_onnx_token_classification_model(model_name, quantize)
+        else:
+            tokenizer = AutoTokenizer.from_pretrained(model_name)
+            model = AutoModelForTokenClassification.from_pretrained(model_name)
+        if aggregation_strategy is None:
+            return pipeline("ner", model=model, tokenizer=tokenizer)
+        return pipeline("ner", model=model, tokenizer=tokenizer, aggregation_strategy=aggregation_strategy)
+
+    model_key = f"transformers:{model_name}"
+    if backend == "onnx":
+        model_key = f"onnx{'-int8' if quantize else ''}:{model_name}"
+    if aggregation_strategy is not None:
+        model_key += f":{aggregation_strategy}"
+    return get_model(model_key, load_pipeline)
+
+
+def print_load_reports():
+    print(f"{len(load_reports)} MODELS LOADED")
+    for load_report in load_reports.values():
+        print(load_report)
+    total_memory = round(sum(load_report.resident_memory_mb for load_report in load_reports.values()), 1)
+    total_seconds = round(sum(load_report.load_seconds for load_report in load_reports.values()), 2)
+    print(f"TOTAL: {total_seconds} s, {total_memory} MB resident")
@@ -1,4 +1,3 @@
-from flair.data import Sentence
 from ollama_entity_extraction.OllamaNERExtractor import OllamaNERExtractor
 
 
@@ -36,23 +35,7 @@ class OllamaLocationExtractor(OllamaNERExtractor):
         return content
 
     def extract_entities_from_text(self, text: str) -> list[dict[str, str | int]]:
-        entity_results = []
+        return self.extract_entities_from_texts([text])[0]
 
-        sentence = Sentence(text)
-        self.ner_model.predict(sentence)
-        flair_result = sentence.get_spans("ner")
-
-        for entity in flair_result:
-            if entity.tag != "GPE":
-                continue
-            entity_results.append(
-                {
-                    "text": entity.text.title(),
-                    "entity_label": entity.tag,
-                    "start_index": entity.start_position,
-                    "end_index": entity.end_position,
-                }
-            )
-
-        entities = self.remove_overlapping_entities(entity_results)
-        return entities
+    def extract_entities_from_texts(self, texts: list[str]) -> list[list[dict[str, str | int]]]:
+        return self.extract_flair_entities_from_texts(texts, {"GPE"})
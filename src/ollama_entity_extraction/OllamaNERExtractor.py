@@ -1,11 +1,17 @@
 import json
+from functools import cached_property
 from pathlib import Path
 
 from Levenshtein import ratio
 from ollama import Client
 from spacy.language import Language
+import flair
 from flair.nn import Classifier
 
+from methods.FlairBatchPredictor import FlairBatchPredictor
+from methods.NERResultCache import NERResultCache
+from model_registry import get_flair_model
+
 from ollama_entity_extraction.data_model.ConsoleTextColor import ConsoleTextColor
 from ollama_entity_extraction.data_model.ConsoleTextStyle import ConsoleTextStyle
 from ollama_entity_extraction.data_model.EntitiesDict import EntitiesDict
@@ -16,13 +22,29 @@ OLLAMA_HOST = "http://localhost:11434"
 
 class OllamaNERExtractor:
     def __init__(
-        self, ner_model: Classifier | Language = None, ollama_model_name: str = "llama3.1", ollama_host: str = OLLAMA_HOST
+        self,
+        ner_model: Classifier | Language = None,
+        ollama_model_name: str = "llama3.1",
+        ollama_host: str = OLLAMA_HOST,
+        mini_batch_size: int = 32,
+        use_result_cache: bool = True,
     ):
-        if ner_model is None:
-            ner_model = Classifier.load("ner-ontonotes-large")
         self.ner_model = ner_model
+        self.mini_batch_size = mini_batch_size
         self.ollama_client = Client(host=ollama_host)
         self.ollama_model_name = ollama_model_name
+        self.use_result_cache = use_result_cache
+
+    @cached_property
+    def flair_predictor(self) -> FlairBatchPredictor:
+        ner_model = self.ner_model if self.ner_model is not None else get_flair_model("ner-ontonotes-large")
+        return FlairBatchPredictor(ner_model, self.mini_batch_size)
+
+    @cached_property
+    def result_cache(self) -> NERResultCache | None:
+        if not self.use_result_cache or self.ner_model is not None:
+            return None
+        return NERResultCache("flair:ner-ontonotes-large", flair.__version__)
 
     @staticmethod
     def save_entity_texts(save_path: str | Path, entity_texts: list[str]):
@@ -186,11 +208,27 @@ class OllamaNERExtractor:
     def extract_entities_from_text(self, text: str) -> list[dict[str, str | int]]:
         pass
 
+    def extract_entities_from_texts(self, texts: list[str]) -> list[list[dict[str, str | int]]]:
+        return [self.extract_entities_from_text(text) for text in texts]
+
+    def extract_flair_entities_from_texts(self, texts: list[str], tags: set[str]) -> list[list[dict[str, str | int]]]:
+        if self.result_cache is None:
+            entities_by_text = self.flair_predictor.predict(texts, tags)
+        else:
+            entities_by_text = self.result_cache.get_or_predict(
+                texts, lambda missing_texts: self.flair_predictor.predict(missing_texts, tags), tags
+            )
+        for entities in entities_by_text:
+            for entity in entities:
+                entity["text"] = entity["text"].title()
+        return [self.remove_overlapping_entities(entities) for entities in entities_by_text]
+
     def extract_entities(self, pdf_name: str, segment_boxes: list[dict], entities_dict: EntitiesDict = None) -> EntitiesDict:
         if entities_dict is None:
             entities_dict = EntitiesDict()
         current_page = 1
         segment_no = 1
+        segments = []
         for segment_box in segment_boxes:
             page_number = segment_box["page_number"]
             if page_number != current_page:
@@ -199,7 +237,11 @@ class OllamaNERExtractor:
             reconstructed_text = " ".join([word for word in segment_box["text"].split()])
             if not reconstructed_text:
                 continue
-            segment_entities = self.extract_entities_from_text(reconstructed_text)
+            segments.append((page_number, segment_no, reconstructed_text))
+            segment_no += 1
+
+        entities_by_segment = self.extract_entities_from_texts([text for _, _, text in segments])
+        for (page_number, segment_no, reconstructed_text), segment_entities in zip(segments, entities_by_segment):
             for entity in segment_entities:
                 entity_text = entity["text"]
                 entity_start_index = entity["start_index"]
@@ -214,6 +256,5 @@ class OllamaNERExtractor:
                     mention_end=entity_end_index,
                     segment_number=segment_no,
                 )
-            segment_no += 1
 
         return entities_dict
@@ -0,0 +1,65 @@
+from os import replace
+from pathlib import Path
+from platform import machine
+from shutil import rmtree
+from tempfile import TemporaryDirectory
+
+from configuration import ONNX_MODELS_PATH
+
+ONNX_FILE_NAME = "model.onnx"
+QUANTIZED_FILE_SUFFIX = "quantized"
+QUANTIZED_FILE_NAME = f"model_{QUANTIZED_FILE_SUFFIX}.onnx"
+
+
+def get_onnx_model_path(model_name: str, cache_path: Path = ONNX_MODELS_PATH) -> Path:
+    return Path(cache_path, model_name.strip("/").replace("/", "__"))
+
+
+def export_onnx_model(model_name: str, cache_path: Path = ONNX_MODELS_PATH) -> Path:
+    from optimum.onnxruntime import ORTModelForTokenClassification
+    from transformers import AutoTokenizer
+
+    model_path = get_onnx_model_path(model_name, cache_path)
+    if Path(model_path, ONNX_FILE_NAME).exists():
+        return model_path
+
+    print(f"EXPORTING {model_name} TO ONNX")
+    with TemporaryDirectory(dir=cache_path) as temporary_path:
+        export_path = Path(temporary_path, model_path.name)
+        model = ORTModelForTokenClassification.from_pretrained(model_name, export=True)
+        model.save_pretrained(export_path)
+        AutoTokenizer.from_pretrained(model_name).save_pretrained(export_path)
+        rmtree(model_path, ignore_errors=True)
+        replace(export_path, model_path)
+    return model_path
+
+
+def quantize_onnx_model(model_name: str, cache_path: Path = ONNX_MODELS_PATH) -> Path:
+    from optimum.onnxruntime import ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    model_path = export_onnx_model(model_name, cache_path)
+    if Path(model_path, QUANTIZED_FILE_NAME).exists():
+        return model_path
+
+    print(f"QUANTIZING {model_name} TO INT8")
+    if machine().lower() in {"arm64", "aarch64"}:
+        quantization_config = AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+    else:
+        quantization_config = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    quantizer = ORTQuantizer.from_pretrained(model_path, file_name=ONNX_FILE_NAME)
+    with TemporaryDirectory(dir=cache_path) as temporary_path:
+        quantizer.quantize(quantization_config, temporary_path, file_suffix=QUANTIZED_FILE_SUFFIX)
+        replace(Path(temporary_path, QUANTIZED_FILE_NAME), Path(model_path, QUANTIZED_FILE_NAME))
+    return model_path
+
+
+def load_onnx_token_classification_model(model_name: str, quantize: bool = False, cache_path: Path = ONNX_MODELS_PATH):
+    from optimum.onnxruntime import ORTModelForTokenClassification
+    from transformers import AutoTokenizer
+
+    model_path = quantize_onnx_model(model_name, cache_path) if quantize else export_onnx_model(model_name, cache_path)
+    file_name = QUANTIZED_FILE_NAME if quantize else ONNX_FILE_NAME
+    model = ORTModelForTokenClassification.from_pretrained(model_path, file_name=file_name, provider="CPUExecutionProvider")
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    return model, tokenizer